@@ -1,13 +1,131 @@
+import time
+from dataclasses import dataclass, field, asdict
+from enum import IntEnum
+
+import numpy as np
 import pandas as pd
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QTableWidget,
-    QTableWidgetItem, QMessageBox, QDoubleSpinBox, QSpinBox, QComboBox, QGridLayout,
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QTableView,
+    QMessageBox, QDoubleSpinBox, QSpinBox, QComboBox, QGridLayout,
     QAbstractItemView, QHeaderView
 )
-from PyQt5.QtCore import QTimer
+from PyQt5.QtCore import QTimer, Qt, QAbstractTableModel, QModelIndex, QThreadPool
 
 # Import the stock_fetcher instance
 from stock_fetcher import stock_fetcher
+from fetch_worker import FetchWorker
+from button_delegate import ButtonDelegate
+
+class RuleType(IntEnum):
+    """
+    Kinds of auto trading rules, in the order they are listed in the rule type combo box.
+    """
+    BUY_LIMIT = 0
+    SELL_STOP = 1
+    SELL_TP = 2
+
+# Maximum age in seconds of a cached price, kept just below the 5 second tick
+_PRICE_TTL = 4.5
+
+# Display labels for each RuleType, indexed by its value
+_RULE_TYPE_LABELS = ("Buy (Limit)", "Sell (Stop Loss)", "Sell (Take Profit)")
+
+@dataclass(slots=True)
+class TradeRule:
+    """
+    A single auto trading rule.
+    """
+    symbol: str
+    rule_type: RuleType
+    target_price: float
+    quantity: int
+    target_price_text: str = field(init=False, repr=False) # Display text, formatted once
+
+    def __post_init__(self):
+        self.target_price_text = f"${self.target_price:.2f}"
+
+# Columns of the DataFrame mirror used to evaluate all rules at once (the TradeRule fields)
+_RULE_COLUMNS = ["symbol", "rule_type", "target_price", "quantity"]
+
+class AutoTradeRulesModel(QAbstractTableModel):
+    """
+    Table model exposing the auto trading rules to the rules QTableView.
+    Cells are produced on demand, so only the visible rows are ever formatted.
+    """
+    HEADERS = ["Stock", "Type", "Target Price", "Quantity", "Remove"]
+    REMOVE_COLUMN = 4
+
+    def __init__(self, rules, parent=None):
+        """
+        Initializes the AutoTradeRulesModel.
+
+        Args:
+            rules (list): The rule list owned by AutoTradingTab. It is shared, not copied.
+            parent (QObject): Optional Qt parent.
+        """
+        super().__init__(parent)
+        self._rules = rules # Shared reference to the auto trading rules
+
+    def rowCount(self, parent=QModelIndex()):
+        """
+        Returns the number of rules.
+        """
+        return 0 if parent.isValid() else len(self._rules)
+
+    def columnCount(self, parent=QModelIndex()):
+        """
+        Returns the number of table columns.
+        """
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        """
+        Returns the display text for a single cell.
+        """
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        rule = self._rules[index.row()]
+        column = index.column()
+        if column == 0:
+            return rule.symbol
+        if column == 1:
+            return _RULE_TYPE_LABELS[rule.rule_type]
+        if column == 2:
+            return rule.target_price_text
+        if column == 3:
+            return str(rule.quantity)
+        return "Remove"
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        """
+        Returns the column header labels.
+        """
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def append_rule(self, rule):
+        """
+        Appends a rule, notifying the view about the single inserted row.
+
+        Args:
+            rule (TradeRule): The rule to append.
+        """
+        row = len(self._rules)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rules.append(rule)
+        self.endInsertRows()
+
+    def remove_rule(self, row):
+        """
+        Removes the rule at the given row, notifying the view about the single removed row.
+
+        Args:
+            row (int): The index of the rule to remove.
+        """
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._rules[row]
+        self.endRemoveRows()
 
 class AutoTradingTab(QWidget):
     """
@@ -22,8 +140,18 @@ class AutoTradingTab(QWidget):
         """
         super().__init__()
         self.market_tab = market_tab # Reference to the market data tab
-        self.auto_trade_rules = [] # List to store auto trading rules
+        self.auto_trade_rules = [] # List of TradeRule objects
+        self._rules_df = pd.DataFrame(columns=_RULE_COLUMNS) # DataFrame mirror of the rules for vectorized checks
+        self._rules_by_symbol = {} # Rows of self._rules_df per symbol: {symbol: [row, ...]}
+        self._last_price_cache = {} # Last evaluated price per symbol: {symbol: price}
+        self._fetch_in_flight = False # True while a tick's prices are being fetched in the background
+        self._trade_notice = None # Non-modal message box summarizing the trades of a tick
+        self._verbose = False # Print per-tick and per-rule diagnostics to the console
         self.timer = QTimer(self) # Timer for simulating price checks
+        self.timer.setSingleShot(True) # Re-armed after each tick completes so ticks never overlap
+        self._interval_ms = 5000 # Target time between the starts of two ticks
+        self._tick_started = 0.0 # time.perf_counter() when the current tick started
+        self._running = False # True while the simulation is started
         self.timer.timeout.connect(self.check_auto_trade_rules) # Connect timeout signal to check rules
         self.init_ui() # Initialize the user interface
 
@@ -46,7 +174,7 @@ class AutoTradingTab(QWidget):
 
         rule_type_label = QLabel("Rule Type:")
         self.rule_type_combo = QComboBox()
-        self.rule_type_combo.addItems(["Buy (Limit)", "Sell (Stop Loss)", "Sell (Take Profit)"])
+        self.rule_type_combo.addItems(_RULE_TYPE_LABELS)
         rules_layout.addWidget(rule_type_label, 1, 0)
         rules_layout.addWidget(self.rule_type_combo, 1, 1)
 
@@ -74,9 +202,13 @@ class AutoTradingTab(QWidget):
 
         # Section for active rules
         layout.addWidget(QLabel("Active Auto Trading Rules:"))
-        self.rules_table = QTableWidget()
-        self.rules_table.setColumnCount(5)
-        self.rules_table.setHorizontalHeaderLabels(["Stock", "Type", "Target Price", "Quantity", "Remove"])
+        self.rules_model = AutoTradeRulesModel(self.auto_trade_rules, self) # Model wrapping the rule list
+        self.rules_table = QTableView()
+        self.rules_table.setModel(self.rules_model)
+        # One delegate paints the "Remove" buttons for every row and reports which row was clicked
+        self.remove_delegate = ButtonDelegate(self)
+        self.remove_delegate.clicked.connect(self.remove_auto_trade_rule)
+        self.rules_table.setItemDelegateForColumn(AutoTradeRulesModel.REMOVE_COLUMN, self.remove_delegate)
         self.rules_table.verticalHeader().setVisible(False) # Hide row numbers
         self.rules_table.setEditTriggers(QAbstractItemView.NoEditTriggers) # Prevent editing
         self.rules_table.setSelectionMode(QAbstractItemView.SingleSelection) # Single row selection
@@ -103,7 +235,7 @@ class AutoTradingTab(QWidget):
         Adds a new auto trading rule based on user input.
         """
         symbol = self.rule_symbol_input.text().strip().upper()
-        rule_type = self.rule_type_combo.currentText()
+        rule_type = RuleType(self.rule_type_combo.currentIndex())
         target_price = self.rule_price_input.value()
         quantity = self.rule_quantity_input.value()
 
@@ -112,21 +244,17 @@ class AutoTradingTab(QWidget):
             return
 
         # Basic validation for sell rules - check if stock is in portfolio
-        if "Sell" in rule_type:
-            if symbol not in self.market_tab.portfolio or self.market_tab.portfolio.get(symbol, 0) < quantity:
+        if rule_type in (RuleType.SELL_STOP, RuleType.SELL_TP):
+            if self.market_tab.portfolio.get(symbol, 0) < quantity:
                  QMessageBox.warning(self, "Insufficient Shares", f"You do not own {quantity} shares of {symbol} to set a sell rule.")
                  return
 
 
-        rule = {
-            "symbol": symbol,
-            "type": rule_type,
-            "target_price": target_price,
-            "quantity": quantity
-        }
+        rule = TradeRule(symbol, rule_type, target_price, quantity)
 
-        self.auto_trade_rules.append(rule)
-        self.update_rules_table() # Update the table display
+        self.rules_model.append_rule(rule) # Adds the rule and inserts its row in the table
+        self._sync_rules_df()
+        self._last_price_cache.pop(symbol, None) # Make sure the new rule is evaluated on the next tick
         self.clear_rule_inputs() # Clear input fields
 
     def remove_auto_trade_rule(self, rule_index):
@@ -134,29 +262,16 @@ class AutoTradingTab(QWidget):
         Removes an auto trading rule by index.
         """
         if 0 <= rule_index < len(self.auto_trade_rules):
-            del self.auto_trade_rules[rule_index]
-            self.update_rules_table() # Update the table display
+            self.rules_model.remove_rule(rule_index) # Removes the rule and its row in the table
+            self._sync_rules_df()
 
-    def update_rules_table(self):
+    def _sync_rules_df(self):
         """
-        Updates the table displaying active auto trading rules.
+        Rebuilds the DataFrame mirror of the auto trading rules and its per-symbol row index
+        after the rule list changes.
         """
-        self.rules_table.setRowCount(0) # Clear existing rows
-        for i, rule in enumerate(self.auto_trade_rules):
-            row_position = self.rules_table.rowCount()
-            self.rules_table.insertRow(row_position)
-
-            self.rules_table.setItem(row_position, 0, QTableWidgetItem(rule["symbol"]))
-            self.rules_table.setItem(row_position, 1, QTableWidgetItem(rule["type"]))
-            self.rules_table.setItem(row_position, 2, QTableWidgetItem(f"${rule['target_price']:.2f}"))
-            self.rules_table.setItem(row_position, 3, QTableWidgetItem(str(rule["quantity"])))
-
-            # Add Remove button
-            remove_button = QPushButton("Remove")
-            # Use a lambda to pass the rule index to the remove method
-            remove_button.clicked.connect(lambda _, index=i: self.remove_auto_trade_rule(index))
-            self.rules_table.setCellWidget(row_position, 4, remove_button)
-
+        self._rules_df = pd.DataFrame([asdict(rule) for rule in self.auto_trade_rules], columns=_RULE_COLUMNS)
+        self._rules_by_symbol = self._rules_df.groupby("symbol").indices
 
     def clear_rule_inputs(self):
         """
@@ -171,8 +286,10 @@ class AutoTradingTab(QWidget):
         """
         Starts the simulated auto trading process.
         """
-        if not self.timer.isActive():
-            self.timer.start(5000) # Check rules every 5 seconds (simulate real-time)
+        if not self._running:
+            self._running = True
+            self._last_price_cache.clear() # Evaluate every rule on the first tick
+            self.timer.start(self._interval_ms) # Check rules every 5 seconds (simulate real-time)
             self.start_button.setEnabled(False)
             self.stop_button.setEnabled(True)
             print("Auto trading simulation started.") # Console notification
@@ -181,116 +298,248 @@ class AutoTradingTab(QWidget):
         """
         Stops the simulated auto trading process.
         """
-        if self.timer.isActive():
+        if self._running:
+            self._running = False
             self.timer.stop()
             self.start_button.setEnabled(True)
             self.stop_button.setEnabled(False)
             print("Auto trading simulation stopped.") # Console notification
 
+    def _fetch_latest_prices(self, symbols):
+        """
+        Fetches the latest closing price for several symbols with a single download.
+
+        Args:
+            symbols (set): The stock ticker symbols to price.
+
+        Returns:
+            dict: Latest closing price per symbol. Symbols without a price are omitted.
+        """
+        if not symbols:
+            return {}
+
+        # One batched request for every symbol instead of one request per rule
+        # A short ttl so every 5 second tick still sees a fresh price
+        data = stock_fetcher.fetch(list(symbols), period="1d", ttl=_PRICE_TTL)
+        if data.empty or 'Close' not in data.columns.get_level_values(0):
+            return {}
+
+        # Slice the closes once and gather every symbol's last price in one pass
+        last_close = data['Close'].iloc[-1]
+        return last_close[last_close.index.isin(symbols)].dropna().to_dict()
+
+    def _show_trade_summary(self, executed_msgs, failed_msgs):
+        """
+        Reports the trades of one tick in a single non-modal message box.
+        Unlike a modal popup per trade, this never blocks the event loop or the next tick.
+
+        Args:
+            executed_msgs (list): Messages for the trades that executed.
+            failed_msgs (list): Messages for the trades that triggered but failed.
+        """
+        shown = []
+        if self._trade_notice is not None and self._trade_notice.isVisible():
+            # Keep the messages the user has not dismissed yet
+            shown = self._trade_notice.text().split("\n")
+            # A rule that cannot be afforded fails again every tick; list its failure only once
+            failed_msgs = [msg for msg in failed_msgs if msg not in shown]
+        if not executed_msgs and not failed_msgs:
+            return
+        lines = shown + executed_msgs + failed_msgs
+
+        if self._trade_notice is None:
+            self._trade_notice = QMessageBox(self)
+            self._trade_notice.setWindowModality(Qt.NonModal)
+
+        if executed_msgs:
+            self._trade_notice.setIcon(QMessageBox.Information)
+            self._trade_notice.setWindowTitle("Simulated Trade Executed")
+        else:
+            self._trade_notice.setIcon(QMessageBox.Warning)
+            self._trade_notice.setWindowTitle("Simulated Trade Failed")
+        self._trade_notice.setText("\n".join(lines))
+        self._trade_notice.show()
+
     def check_auto_trade_rules(self):
         """
         Checks active auto trading rules against current stock prices (simulated).
-        Executes simulated trades if rules are met.
+        Starts the price fetch for this tick; the rules are evaluated once the prices arrive.
+        """
+        if self._fetch_in_flight:
+            return # The previous tick's prices are still loading; don't queue another fetch
+        self._tick_started = time.perf_counter()
+        if self._verbose:
+            print("Checking auto trade rules...") # Console notification
+
+        # Fetch the latest available price for every distinct symbol on a worker thread
+        # For simulation, this is the latest price from yfinance (which might be delayed)
+        symbols = {rule.symbol for rule in self.auto_trade_rules}
+        if not symbols:
+            self._schedule_next_tick()
+            return
+        self._fetch_in_flight = True
+        worker = FetchWorker(symbols, self._fetch_latest_prices, symbols)
+        worker.signals.finished.connect(self._on_prices_ready)
+        worker.signals.failed.connect(self._on_prices_failed)
+        QThreadPool.globalInstance().start(worker)
+
+    def _on_prices_failed(self, symbols, error):
+        """
+        Handles a failed background price fetch.
+
+        Args:
+            symbols (set): The symbols that were requested.
+            error (str): The error message.
+        """
+        self._fetch_in_flight = False
+        print(f"Error fetching prices for auto trade rules: {error}") # Console notification
+        self._schedule_next_tick()
+
+    def _schedule_next_tick(self):
+        """
+        Re-arms the single-shot timer once a tick has completed.
+        The time the tick took (mostly the price fetch) is subtracted from the interval to keep
+        a steady cadence, but the next tick always waits at least one second.
+        """
+        if not self._running:
+            return
+        elapsed_ms = int((time.perf_counter() - self._tick_started) * 1000)
+        self.timer.start(max(1000, self._interval_ms - elapsed_ms))
+
+    def _on_prices_ready(self, symbols, prices):
+        """
+        Evaluates the rules once the background price fetch finished. Runs on the GUI thread.
+
+        Args:
+            symbols (set): The symbols that were requested.
+            prices (dict): Latest closing price per symbol, as returned by _fetch_latest_prices.
+        """
+        self._fetch_in_flight = False
+        if not self._running:
+            return # The simulation was stopped while the prices were loading
+        try:
+            self._evaluate_rules(symbols, prices)
+        finally:
+            self._schedule_next_tick()
+
+    def _evaluate_rules(self, symbols, prices):
+        """
+        Checks the rules against the fetched prices and executes the simulated trades that trigger.
+        All candidate rules are compared in one vectorized pass; only the rules that trigger are
+        visited individually to update the portfolio.
+
+        Args:
+            symbols (set): The symbols that were requested.
+            prices (dict): Latest closing price per symbol.
         """
-        print("Checking auto trade rules...") # Console notification
         executed_rules_indices = [] # Keep track of rules to remove after checking
+        executed_msgs = [] # Trades executed this tick, reported together after the loop
+        failed_msgs = [] # Trades that triggered but could not execute this tick
 
-        for i, rule in enumerate(self.auto_trade_rules):
-            symbol = rule["symbol"]
-            rule_type = rule["type"]
-            target_price = rule["target_price"]
-            quantity = rule["quantity"]
+        for symbol in symbols - prices.keys():
+            print(f"Could not fetch current price for {symbol}. Skipping rule.")
+
+        # A rule can only change outcome when its symbol's price moved since the last tick,
+        # so only rules on changed symbols are evaluated
+        changed_prices = {
+            symbol: price for symbol, price in prices.items()
+            if self._last_price_cache.get(symbol) != price
+        }
+        retry_symbols = set() # Symbols with a triggered rule that could not execute this tick
+
+        # Evaluate the candidate rules at once, keeping them in the order they were added
+        candidate_rows = sorted(
+            row for symbol in changed_prices for row in self._rules_by_symbol.get(symbol, ())
+        )
+        rules = self._rules_df.iloc[candidate_rows]
+        current_prices = rules["symbol"].map(changed_prices).astype(float)
+        target_prices = rules["target_price"].astype(float)
+        rule_types = rules["rule_type"]
+        trigger_kind = np.select(
+            [
+                (rule_types == RuleType.BUY_LIMIT) & (current_prices <= target_prices),
+                (rule_types == RuleType.SELL_STOP) & (current_prices <= target_prices),
+                (rule_types == RuleType.SELL_TP) & (current_prices >= target_prices),
+            ],
+            [RuleType.BUY_LIMIT, RuleType.SELL_STOP, RuleType.SELL_TP],
+            default=-1,
+        )
+
+        if self._verbose:
+            for i in rules.index:
+                rule = self.auto_trade_rules[i]
+                print(f"Checking rule for {rule.symbol} ({_RULE_TYPE_LABELS[rule.rule_type]}). "
+                      f"Current Price: ${current_prices[i]:.2f}, Target Price: {rule.target_price_text}") # Console notification
+
+        portfolio = self.market_tab.portfolio
+        settings_tab = self.market_tab.settings_tab
+        # Cost of every candidate rule in one multiplication; only triggered buys use theirs
+        costs = (current_prices * rules["quantity"]).to_numpy()
+
+        # Triggered rules run in the order they were added, each checked against the cash and shares left
+        for n in np.flatnonzero(trigger_kind >= 0):
+            i = rules.index[n]
+            rule = self.auto_trade_rules[i]
+            symbol = rule.symbol
+            rule_label = _RULE_TYPE_LABELS[rule.rule_type]
+            quantity = rule.quantity
+            current_price = current_prices[i]
 
-            # Simulate fetching the current price
-            # In a real application, you would fetch the actual current price here.
-            # For simulation, we'll fetch the latest available price from yfinance (which might be delayed)
             try:
-                data = stock_fetcher.fetch(symbol, period="1d")
-                if data.empty or ('Close', symbol) not in data.columns:
-                    print(f"Could not fetch current price for {symbol}. Skipping rule.")
+                if rule.rule_type is RuleType.BUY_LIMIT:
+                    # Simulate a limit buy order: price is at or below target price
+                    print(f"Simulated Buy Order Triggered: {quantity} shares of {symbol} at ${current_price:.2f}") # Console notification
+                    total_cost = float(costs[n])
+                    if settings_tab.simulated_cash >= total_cost:
+                        settings_tab.simulated_cash -= total_cost
+                        portfolio[symbol] = portfolio.get(symbol, 0) + quantity
+                        executed_msgs.append(f"Simulated Buy: {quantity} shares of {symbol} at ${current_price:.2f}")
+                        executed_rules_indices.append(i) # Mark rule for removal
+                    else:
+                        # Later, cheaper buys are still tried with the remaining cash
+                        print(f"Simulated Buy Failed: Insufficient funds for {symbol}.") # Console notification
+                        failed_msgs.append(f"Simulated Buy Failed: Insufficient funds for {symbol}.")
+                        retry_symbols.add(symbol)
                     continue
 
-                current_price = data[('Close', symbol)].iloc[-1]
-                if isinstance(current_price, pd.Series):
-                     current_price = current_price.squeeze()
-                if pd.isna(current_price):
-                     print(f"Current price for {symbol} is not available. Skipping rule.")
-                     continue
-
-                print(f"Checking rule for {symbol} ({rule_type}). Current Price: ${current_price:.2f}, Target Price: ${target_price:.2f}") # Console notification
-
-                trade_executed = False
-
-                if rule_type == "Buy (Limit)":
-                    # Simulate a limit buy order: buy if current price is at or below target price
-                    if current_price <= target_price:
-                        print(f"Simulated Buy Order Triggered: {quantity} shares of {symbol} at ${current_price:.2f}") # Console notification
-                        # Simulate the buy action
-                        total_cost = current_price * quantity
-                        if self.market_tab.settings_tab.simulated_cash >= total_cost:
-                            self.market_tab.settings_tab.simulated_cash -= total_cost
-                            self.market_tab.portfolio[symbol] = self.market_tab.portfolio.get(symbol, 0) + quantity
-                            self.market_tab.update_portfolio_and_cash()
-                            self.market_tab.update_watchlist_table() # Update watchlist to show owned status
-                            QMessageBox.information(self, "Simulated Trade Executed",
-                                                    f"Simulated Buy: {quantity} shares of {symbol} at ${current_price:.2f}")
-                            trade_executed = True
-                        else:
-                            print(f"Simulated Buy Failed: Insufficient funds for {symbol}.") # Console notification
-                            QMessageBox.warning(self, "Simulated Trade Failed",
-                                                f"Simulated Buy Failed: Insufficient funds for {symbol}.")
-
-
-                elif rule_type == "Sell (Stop Loss)":
-                    # Simulate a stop loss order: sell if current price is at or below target price
-                    # Also check if the user actually owns the stock
-                    if current_price <= target_price and self.market_tab.portfolio.get(symbol, 0) >= quantity:
-                        print(f"Simulated Sell (Stop Loss) Triggered: {quantity} shares of {symbol} at ${current_price:.2f}") # Console notification
-                        # Simulate the sell action
-                        total_sale = current_price * quantity
-                        self.market_tab.portfolio[symbol] = self.market_tab.portfolio.get(symbol, 0) - quantity
-                        self.market_tab.settings_tab.simulated_cash += total_sale
-                        if self.market_tab.portfolio[symbol] == 0:
-                             del self.market_tab.portfolio[symbol]
-                        self.market_tab.update_portfolio_and_cash()
-                        self.market_tab.update_watchlist_table() # Update watchlist to show owned status
-                        QMessageBox.information(self, "Simulated Trade Executed",
-                                                f"Simulated Sell (Stop Loss): {quantity} shares of {symbol} at ${current_price:.2f}")
-                        trade_executed = True
-                    elif current_price <= target_price and self.market_tab.portfolio.get(symbol, 0) < quantity:
-                         print(f"Simulated Sell (Stop Loss) Failed: Insufficient shares for {symbol}.") # Console notification
-                         # Rule remains active if shares are insufficient, might execute later if more shares are acquired
-                         pass # Don't mark for deletion if shares are insufficient
-
-                elif rule_type == "Sell (Take Profit)":
-                    # Simulate a take profit order: sell if current price is at or above target price
-                     # Also check if the user actually owns the stock
-                    if current_price >= target_price and self.market_tab.portfolio.get(symbol, 0) >= quantity:
-                        print(f"Simulated Sell (Take Profit) Triggered: {quantity} shares of {symbol} at ${current_price:.2f}") # Console notification
-                        # Simulate the sell action
-                        total_sale = current_price * quantity
-                        self.market_tab.portfolio[symbol] = self.market_tab.portfolio.get(symbol, 0) - quantity
-                        self.market_tab.settings_tab.simulated_cash += total_sale
-                        if self.market_tab.portfolio[symbol] == 0:
-                             del self.market_tab.portfolio[symbol]
-                        self.market_tab.update_portfolio_and_cash()
-                        self.market_tab.update_watchlist_table() # Update watchlist to show owned status
-                        QMessageBox.information(self, "Simulated Trade Executed",
-                                                f"Simulated Sell (Take Profit): {quantity} shares of {symbol} at ${current_price:.2f}")
-                        trade_executed = True
-                    elif current_price >= target_price and self.market_tab.portfolio.get(symbol, 0) < quantity:
-                         print(f"Simulated Sell (Take Profit) Failed: Insufficient shares for {symbol}.") # Console notification
-                         # Rule remains active if shares are insufficient, might execute later if more shares are acquired
-                         pass # Don't mark for deletion if shares are insufficient
-
-                if trade_executed:
+                owned = portfolio.get(symbol, 0) # Shares currently held, looked up once per rule
+                if owned >= quantity:
+                    # Simulate a stop loss (price at or below target) or take profit (price at or above target) order
+                    print(f"Simulated {rule_label} Triggered: {quantity} shares of {symbol} at ${current_price:.2f}") # Console notification
+                    # Simulate the sell action
+                    settings_tab.simulated_cash += float(costs[n])
+                    if owned == quantity:
+                        del portfolio[symbol] # Remove the symbol once no shares are left
+                    else:
+                        portfolio[symbol] = owned - quantity
+                    executed_msgs.append(f"Simulated {rule_label}: {quantity} shares of {symbol} at ${current_price:.2f}")
                     executed_rules_indices.append(i) # Mark rule for removal
+                else:
+                    print(f"Simulated {rule_label} Failed: Insufficient shares for {symbol}.") # Console notification
+                    # Rule remains active if shares are insufficient, might execute later if more shares are acquired
+                    retry_symbols.add(symbol)
 
             except Exception as e:
                 print(f"Error checking rule for {symbol}: {e}") # Console notification
+                retry_symbols.add(symbol)
+
+        if executed_rules_indices:
+            # Show the traded stocks at the prices they traded at, not an older cached download
+            for i in executed_rules_indices:
+                stock_fetcher.invalidate(self.auto_trade_rules[i].symbol)
+            # Refresh the market tab once for all trades of this tick
+            self.market_tab.update_portfolio_and_cash()
+            self.market_tab.update_watchlist_table() # Update watchlist to show owned status
+        self._show_trade_summary(executed_msgs, failed_msgs)
+
+        # Remember the evaluated prices; symbols with a blocked rule are re-checked next tick
+        self._last_price_cache.update(changed_prices)
+        for symbol in retry_symbols:
+            self._last_price_cache.pop(symbol, None)
 
         # Remove executed rules in reverse order to avoid index issues
-        for index in sorted(executed_rules_indices, reverse=True):
-            del self.auto_trade_rules[index]
-
-        self.update_rules_table() # Update the table after removing executed rules
+        # The table is only touched when something executed, and only for the executed rows
+        if executed_rules_indices:
+            for index in sorted(executed_rules_indices, reverse=True):
+                self.rules_model.remove_rule(index)
+            self._sync_rules_df()
@@ -0,0 +1,47 @@
+from PyQt5.QtCore import Qt, QEvent, pyqtSignal
+from PyQt5.QtWidgets import QApplication, QStyle, QStyledItemDelegate, QStyleOptionButton
+
+class ButtonDelegate(QStyledItemDelegate):
+    """
+    Paints a push button in every cell of a table column and reports clicks on it.
+    One delegate serves the whole column, so no QPushButton widget is created per row.
+    The button text is the cell's display text; cells without Qt.ItemIsEnabled paint a disabled button.
+    Like a focused QPushButton, the button of the current cell is also pressed with Space.
+    """
+    clicked = pyqtSignal(int) # Row of the clicked button
+
+    def paint(self, painter, option, index):
+        """
+        Draws the cell as a push button using the view's style, palette, font and layout direction.
+        """
+        button = QStyleOptionButton()
+        button.rect = option.rect
+        # The view's palette, so a disabled button is drawn with the theme's disabled colors
+        button.palette = option.palette
+        button.fontMetrics = option.fontMetrics
+        button.direction = option.direction
+        button.text = str(index.data(Qt.DisplayRole) or "")
+        button.state = QStyle.State_Raised
+        if index.flags() & Qt.ItemIsEnabled:
+            button.state |= QStyle.State_Enabled
+        if option.state & QStyle.State_HasFocus:
+            button.state |= QStyle.State_HasFocus
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawControl(QStyle.CE_PushButton, button, painter, option.widget)
+
+    def editorEvent(self, event, model, option, index):
+        """
+        Emits clicked(row) when the left mouse button is released over an enabled button,
+        or when Space is pressed while its cell is the view's current cell.
+        """
+        if not index.flags() & Qt.ItemIsEnabled:
+            return super().editorEvent(event, model, option, index)
+        if (event.type() == QEvent.MouseButtonRelease
+                and event.button() == Qt.LeftButton
+                and option.rect.contains(event.pos())):
+            self.clicked.emit(index.row())
+            return True
+        if event.type() == QEvent.KeyPress and event.key() in (Qt.Key_Space, Qt.Key_Select):
+            self.clicked.emit(index.row())
+            return True
+        return super().editorEvent(event, model, option, index)
@@ -0,0 +1,43 @@
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+class FetchSignals(QObject):
+    """
+    Signals emitted by a FetchWorker.
+    Slots connected from the GUI thread are invoked on the GUI thread.
+    """
+    finished = pyqtSignal(object, object) # (tag, result of the fetch function)
+    failed = pyqtSignal(object, str) # (tag, error message)
+
+
+class FetchWorker(QRunnable):
+    """
+    Runs a blocking fetch function on a QThreadPool thread so network I/O never blocks the GUI.
+    Only the result crosses back to the GUI thread, through FetchSignals.
+    """
+    def __init__(self, tag, fn, *args, **kwargs):
+        """
+        Initializes the FetchWorker.
+
+        Args:
+            tag (object): Passed back unchanged with the result so the receiver can tell requests apart.
+            fn (callable): The blocking function to run. It must not touch any Qt widgets.
+            *args: Positional arguments for fn.
+            **kwargs: Keyword arguments for fn.
+        """
+        super().__init__()
+        self.tag = tag
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = FetchSignals()
+
+    def run(self):
+        """
+        Calls the fetch function on the worker thread and emits its result or error.
+        """
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.failed.emit(self.tag, str(e))
+            return
+        self.signals.finished.emit(self.tag, result)
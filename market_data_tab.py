@@ -1,22 +1,213 @@
-import pandas as pd
+import math
+
 import matplotlib.dates as mdates
+import numpy as np
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QTableWidget,
-    QTableWidgetItem, QMessageBox, QSpinBox, QInputDialog, QAbstractItemView, QHeaderView
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QTableView,
+    QMessageBox, QSpinBox, QInputDialog, QAbstractItemView, QHeaderView
 )
 from PyQt5.QtGui import QColor, QBrush
+from PyQt5.QtCore import QThreadPool, QTimer, QSignalBlocker, Qt, QAbstractTableModel, QModelIndex
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
-import yfinance as yf
 
 
 # Import the stock_fetcher instance
-from stock_fetcher import stock_fetcher
+from stock_fetcher import stock_fetcher, QUOTE_FIELDS
+from fetch_worker import FetchWorker
+from button_delegate import ButtonDelegate
+from multiple_roles_delegate import MULTIPLE_ROLES, MultipleRolesDelegate
+
+# Period downloaded for the table prices. Its data keeps float64, so values are exact to the cent.
+_QUOTE_PERIOD = "1d"
+# Period downloaded for the plot. Its data is stored as float32, which is only precise enough to plot.
+_PLOT_PERIOD = "1mo"
+# Maximum age in seconds of a cached download the table prices are taken from
+_QUOTE_TTL = 60
+# Maximum age in seconds of a cached price a buy or sell is made at
+_TRADE_TTL = 5
+
+def _format_prices(prices):
+    """
+    Formats prices for table cells, all at once with NumPy's string formatting.
+
+    Args:
+        prices (ndarray): The prices, NaN where unavailable.
+
+    Returns:
+        ndarray: Strings of the same shape, each price with two decimals or "N/A".
+    """
+    return np.where(np.isnan(prices), "N/A", np.char.mod("%.2f", prices))
+
+# Quote of a symbol without data: every price missing
+_NO_QUOTE = (math.nan,) * len(QUOTE_FIELDS)
+
+class SymbolRowsModel(QAbstractTableModel):
+    """
+    Base table model for the market tables: one row per symbol, held as a plain list.
+    Each row is a list starting with the symbol; subclasses define HEADERS and data().
+    Cells are produced on demand, so only the visible rows are ever asked for.
+    """
+    HEADERS = []
+
+    def __init__(self, parent=None):
+        """
+        Initializes the SymbolRowsModel.
+
+        Args:
+            parent (QObject): Optional Qt parent.
+        """
+        super().__init__(parent)
+        self._rows = [] # Row values, in display order
+
+    def rowCount(self, parent=QModelIndex()):
+        """
+        Returns the number of rows.
+        """
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        """
+        Returns the number of table columns.
+        """
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        """
+        Returns the column header labels.
+        """
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def symbol_at(self, row):
+        """
+        Returns the symbol shown in the given row.
+        """
+        return self._rows[row][0]
+
+    def set_rows(self, rows):
+        """
+        Replaces the row values.
+        Rows of symbols that are gone are removed and rows for new symbols are appended, each
+        with its own notification. For rows that stay, a single dataChanged covers just the span
+        whose values differ, so the view repaints nothing when a refresh changed nothing. The
+        model is reset only when the remaining symbols were reordered.
+
+        Args:
+            rows (list): The new rows, each a list starting with the symbol.
+        """
+        keep = {row[0] for row in rows}
+        for position in range(len(self._rows) - 1, -1, -1): # Bottom up so row numbers stay valid
+            if self._rows[position][0] not in keep:
+                self.beginRemoveRows(QModelIndex(), position, position)
+                del self._rows[position]
+                self.endRemoveRows()
+
+        kept = len(self._rows)
+        if [row[0] for row in rows[:kept]] != [row[0] for row in self._rows]:
+            # Remaining symbols were reordered
+            self.beginResetModel()
+            self._rows = list(rows)
+            self.endResetModel()
+            return
+
+        changed = [position for position in range(kept) if self._rows[position] != rows[position]]
+        if changed:
+            self._rows[:kept] = rows[:kept]
+            self.dataChanged.emit(self.index(changed[0], 0),
+                                  self.index(changed[-1], len(self.HEADERS) - 1))
+        if len(rows) > kept:
+            self.beginInsertRows(QModelIndex(), kept, len(rows) - 1)
+            self._rows.extend(rows[kept:])
+            self.endInsertRows()
+
+class WatchlistModel(SymbolRowsModel):
+    """
+    Table model of the watchlist.
+    Rows are [symbol, open text, high text, low text, close text, owned].
+    """
+    HEADERS = ["Stock", "Open", "High", "Low", "Close", "Buy", "Owned", " "]
+    BUY_COLUMN = 5
+    OWNED_COLUMN = 6
+    REMOVE_COLUMN = 7
+
+    # Shared by every row instead of being created per cell
+    _OWNED_BRUSH = QBrush(QColor("green")) # Text color of the Owned indicator if owned
+    _NOT_OWNED_BRUSH = QBrush(QColor("red")) # Text color of the Owned indicator if not owned
+
+    def data(self, index, role=Qt.DisplayRole):
+        """
+        Returns the display text, and for the Owned column the color and alignment, of a cell.
+        MULTIPLE_ROLES returns all of them at once for MultipleRolesDelegate.
+        """
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        column = index.column()
+        if role == MULTIPLE_ROLES:
+            if column == self.OWNED_COLUMN:
+                return {
+                    Qt.DisplayRole: "Yes" if row[5] else "No",
+                    # Text color green if owned, red if not
+                    Qt.ForegroundRole: self._OWNED_BRUSH if row[5] else self._NOT_OWNED_BRUSH,
+                    Qt.TextAlignmentRole: Qt.AlignCenter,
+                }
+            return {Qt.DisplayRole: self.data(index)}
+        if role == Qt.DisplayRole:
+            if column < self.BUY_COLUMN:
+                return row[column]
+            if column == self.BUY_COLUMN:
+                return "Buy"
+            if column == self.OWNED_COLUMN:
+                return "Yes" if row[5] else "No"
+            return "X"
+        if column == self.OWNED_COLUMN:
+            if role == Qt.ForegroundRole:
+                # Text color green if owned, red if not
+                return self._OWNED_BRUSH if row[5] else self._NOT_OWNED_BRUSH
+            if role == Qt.TextAlignmentRole:
+                return Qt.AlignCenter
+        return None
+
+    def flags(self, index):
+        """
+        Disables the remove button of owned stocks.
+        """
+        flags = super().flags(index)
+        if index.isValid() and index.column() == self.REMOVE_COLUMN and self._rows[index.row()][5]:
+            flags &= ~Qt.ItemIsEnabled
+        return flags
+
+class PortfolioModel(SymbolRowsModel):
+    """
+    Table model of the portfolio.
+    Rows are [symbol, price text, quantity text, value text].
+    """
+    HEADERS = ["Stock", "Price", "Quantity", "Value", "Sell"]
+    SELL_COLUMN = 4
+
+    def data(self, index, role=Qt.DisplayRole):
+        """
+        Returns the display text for a single cell.
+        MULTIPLE_ROLES returns it as {Qt.DisplayRole: text} for MultipleRolesDelegate.
+        """
+        if not index.isValid():
+            return None
+        if role == MULTIPLE_ROLES:
+            return {Qt.DisplayRole: self.data(index)}
+        if role != Qt.DisplayRole:
+            return None
+        column = index.column()
+        if column == self.SELL_COLUMN:
+            return "Sell"
+        return self._rows[index.row()][column]
 
 class MarketDataTab(QWidget):
     """
     Provides the main market data tab with watchlist and portfolio.
     """
+
     def __init__(self, settings_tab):
         """
         Initializes the MarketDataTab.
@@ -28,7 +219,25 @@ class MarketDataTab(QWidget):
         self.settings_tab = settings_tab # Reference to the settings tab
         self.tracked_symbols = []  # List of all symbols ever added to watchlist (for plotting)
         self.watchlist_symbols = []  # Symbols currently in the watchlist table
+        self._watchlist_set = set()  # Same symbols as watchlist_symbols, for fast membership checks
         self.portfolio = {}  # Stores the quantity of stocks bought: {symbol: quantity}
+        self.pool = QThreadPool.globalInstance() # Runs the table and plot downloads off the GUI thread
+        self._refresh_ids = {} # Latest request id per refresh target; older results are dropped
+        self._next_request_id = 0 # Source of the request ids above
+        self._pending_refresh = set() # Targets to refresh when the coalescing timer fires
+        self._trades_in_flight = set() # Symbols of buys and sells waiting for their price
+        self._validated_symbols = set() # Tickers found valid this session; adding them again skips the check
+        # (symbols, holdings, id of the quotes) each table was last filled from, and those quotes
+        self._watchlist_key = None
+        self._watchlist_quotes = None
+        self._portfolio_key = None
+        self._portfolio_quotes = None
+        self._stock_value = 0.0 # Value of all holdings at the last portfolio table fill
+        # Refresh requests made in quick succession (e.g. by one buy) are merged into one refresh
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(150)
+        self._refresh_timer.timeout.connect(self._do_refresh)
         self.figure = Figure(figsize=(8, 6)) # Matplotlib figure for plotting
         self.canvas = FigureCanvas(self.figure) # Canvas to display the figure
         self.ax = self.figure.add_subplot(111) # Add a subplot to the figure
@@ -59,10 +268,16 @@ class MarketDataTab(QWidget):
 
 
         # Portfolio table
-        self.stock_table = QTableWidget() # Table to display portfolio holdings
-        # Updated column count and headers (removed "Sell Qty")
-        self.stock_table.setColumnCount(5)
-        self.stock_table.setHorizontalHeaderLabels(["Stock", "Price", "Quantity", "Value", "Sell"])
+        self.portfolio_model = PortfolioModel(self) # Model holding the portfolio rows
+        self.stock_table = QTableView() # Table to display portfolio holdings
+        self.stock_table.setModel(self.portfolio_model)
+        # Text cells are painted with one data() call each instead of one per role
+        self.text_delegate = MultipleRolesDelegate(self)
+        self.stock_table.setItemDelegate(self.text_delegate)
+        # One delegate paints the "Sell" buttons for every row and reports which row was clicked
+        self.sell_delegate = ButtonDelegate(self)
+        self.sell_delegate.clicked.connect(self._on_sell_clicked)
+        self.stock_table.setItemDelegateForColumn(PortfolioModel.SELL_COLUMN, self.sell_delegate)
         # Allow only single row selection
         self.stock_table.setSelectionMode(QAbstractItemView.SingleSelection)
         # Prevent user from editing table cells
@@ -74,10 +289,17 @@ class MarketDataTab(QWidget):
         layout.addWidget(self.stock_table) # Add portfolio table to layout
 
         # Watchlist table
-        self.watchlist_table = QTableWidget() # Table to display watchlist stocks
-        # Updated column count and headers
-        self.watchlist_table.setColumnCount(8)
-        self.watchlist_table.setHorizontalHeaderLabels(["Stock", "Open", "High", "Low", "Close", "Buy", "Owned", " "])
+        self.watchlist_model = WatchlistModel(self) # Model holding the watchlist rows
+        self.watchlist_table = QTableView() # Table to display watchlist stocks
+        self.watchlist_table.setModel(self.watchlist_model)
+        self.watchlist_table.setItemDelegate(self.text_delegate)
+        # Delegates paint the "Buy" and "X" buttons for every row and report which row was clicked
+        self.buy_delegate = ButtonDelegate(self)
+        self.buy_delegate.clicked.connect(self._on_buy_clicked)
+        self.watchlist_table.setItemDelegateForColumn(WatchlistModel.BUY_COLUMN, self.buy_delegate)
+        self.remove_delegate = ButtonDelegate(self)
+        self.remove_delegate.clicked.connect(self._on_remove_clicked)
+        self.watchlist_table.setItemDelegateForColumn(WatchlistModel.REMOVE_COLUMN, self.remove_delegate)
         # Allow only single row selection
         self.watchlist_table.setSelectionMode(QAbstractItemView.SingleSelection)
         # Prevent user from editing table cells
@@ -119,6 +341,20 @@ class MarketDataTab(QWidget):
         # Add the matplotlib canvas to the layout for plotting
         layout.addWidget(self.canvas)
 
+        # Plot setup that never changes is done once here instead of on every refresh
+        self._lines = {} # Plotted closing price line per symbol: {symbol: Line2D}
+        self._plot_key = None # (watchlist symbols, id of the plot arrays) of the current drawing
+        self._plotted_closes = None # The plot arrays currently drawn
+        self._plot_background = None # Figure without the lines, saved after each full draw
+        self.canvas.mpl_connect("draw_event", self._on_canvas_draw)
+        self.ax.set_xlabel("Date") # Set x-axis label
+        self.ax.set_ylabel("Closing Price") # Set y-axis label
+        self.ax.grid(True) # Add grid
+        self.ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d')) # Format dates
+        self.ax.xaxis.set_major_locator(mdates.AutoDateLocator()) # Auto-locate date ticks
+        # Rotate the date labels; ticks created later copy this, so it is not repeated per refresh
+        self.figure.autofmt_xdate()
+
 
         self.setLayout(layout) # Set the main layout for the widget
 
@@ -141,119 +377,216 @@ class MarketDataTab(QWidget):
     def _add_stock_to_watchlist_handler(self):
         """
         Handles adding a stock to the watchlist.
-        Fetches data to validate the ticker before adding.
+        Fetches data in the background to validate the ticker before adding; the stock is added
+        by _on_add_validated. The validation downloads the same batch the tables refresh with next,
+        so the tables cost no extra request.
         """
         symbol = self.search_bar.text().strip().upper() # Get symbol from search bar, clean and capitalize
         if not symbol:
             return # Do nothing if symbol is empty
+        if symbol in self._validated_symbols:
+            self._add_validated_symbol(symbol) # Already checked this session
+            return
 
-        try:
-            # Fetch 1 day of data to validate the ticker
-            data = yf.download(symbol, period="1d", progress=False)
-            if data.empty:
-                # Show warning if ticker is not found or data is unavailable
-                QMessageBox.warning(self, "Invalid Ticker", f"Stock ticker '{symbol}' not found or data unavailable.")
-            elif symbol not in self.watchlist_symbols:
-                # Add symbol to watchlist and tracked symbols if not already present
-                self.watchlist_symbols.append(symbol)
-                self.tracked_symbols.append(symbol)
-                self.update_watchlist_table() # Update the watchlist table display
-                self.plot_stocks() # Update the plot
-                self.search_bar.clear() # Clear the search bar
-        except Exception as e:
-            # Show critical error message if an exception occurs
-            QMessageBox.critical(self, "Error", f"An error occurred while checking ticker '{symbol}': {e}")
+        self.add_button.setEnabled(False) # One validation at a time
+        # Validate the ticker with the batch the refresh afterwards will use, served from the cache then
+        worker = FetchWorker(("add", symbol), stock_fetcher.fetch_many,
+                             self._display_symbols() + [symbol], period=_QUOTE_PERIOD, ttl=_QUOTE_TTL)
+        worker.signals.finished.connect(self._on_add_validated)
+        worker.signals.failed.connect(self._on_add_failed)
+        self.pool.start(worker)
+
+    def _on_add_validated(self, tag, frames):
+        """
+        Adds a validated stock to the watchlist, or reports an invalid ticker.
+
+        Args:
+            tag (tuple): ("add", symbol) given to the FetchWorker.
+            frames (dict): {symbol: DataFrame} returned by stock_fetcher.fetch_many.
+        """
+        symbol = tag[1]
+        self.add_button.setEnabled(True)
+        if symbol not in frames:
+            # Show warning if ticker is not found or data is unavailable
+            QMessageBox.warning(self, "Invalid Ticker", f"Stock ticker '{symbol}' not found or data unavailable.")
+            return
+        self._validated_symbols.add(symbol)
+        self._add_validated_symbol(symbol)
+
+    def _add_validated_symbol(self, symbol):
+        """
+        Adds a valid ticker to the watchlist and tracked symbols if not already present.
+
+        Args:
+            symbol (str): The validated symbol.
+        """
+        if symbol not in self._watchlist_set:
+            self._append_to_watchlist(symbol)
+            self.tracked_symbols.append(symbol)
+            self._schedule_refresh({"watchlist", "plot"}) # Update the watchlist table and the plot
+            if self.search_bar.text().strip().upper() == symbol:
+                self.search_bar.clear() # Clear the search bar unless something new was typed meanwhile
+
+    def _on_add_failed(self, tag, error):
+        """
+        Reports an error raised while validating a ticker.
+        """
+        self.add_button.setEnabled(True)
+        # Show critical error message if an exception occurs
+        QMessageBox.critical(self, "Error", f"An error occurred while checking ticker '{tag[1]}': {error}")
 
     def _clear_watchlist_handler(self):
         """
         Clears all stocks from the watchlist that are NOT currently in the portfolio.
         """
-        # Create a list of symbols to remove (those in watchlist but not portfolio)
-        symbols_to_remove = [symbol for symbol in self.watchlist_symbols if symbol not in self.portfolio]
-        for symbol in symbols_to_remove:
-            self.watchlist_symbols.remove(symbol) # Remove symbol from the watchlist list
-        self.update_watchlist_table() # Update the watchlist table display
-        self.plot_stocks() # Update the plot
+        # Keep only the symbols in the portfolio, in one pass instead of removing symbols one by one
+        self.watchlist_symbols = [symbol for symbol in self.watchlist_symbols if symbol in self.portfolio]
+        self._watchlist_set = set(self.watchlist_symbols)
+        self._schedule_refresh({"watchlist", "plot"}) # Update the watchlist table and the plot
+
+    def _append_to_watchlist(self, symbol):
+        """
+        Adds a symbol to the end of the watchlist, keeping _watchlist_set in step.
+
+        Args:
+            symbol (str): A symbol not yet in the watchlist.
+        """
+        self.watchlist_symbols.append(symbol)
+        self._watchlist_set.add(symbol)
+
+    def _display_symbols(self):
+        """
+        Returns every symbol shown in the watchlist or portfolio table.
+        Both tables fetch this same list so they share one batched download.
+
+        Returns:
+            list: Watchlist symbols followed by any portfolio symbols not in the watchlist.
+        """
+        return self.watchlist_symbols + [s for s in self.portfolio if s not in self._watchlist_set]
+
+    def _schedule_refresh(self, targets):
+        """
+        Asks for a refresh of tables and/or the plot.
+        Requests arriving within 150 ms of each other are merged, so each target is refreshed once.
+
+        Args:
+            targets (set): Any of "watchlist", "portfolio" and "plot".
+        """
+        self._pending_refresh |= targets
+        if not self._refresh_timer.isActive():
+            self._refresh_timer.start()
+
+    def _do_refresh(self):
+        """
+        Starts the downloads for every pending refresh target.
+        The watchlist and portfolio tables show the same symbols, so they share one request.
+        """
+        pending = self._pending_refresh
+        self._pending_refresh = set()
+        tables = tuple(t for t in ("watchlist", "portfolio") if t in pending)
+        if tables:
+            self._request_refresh(tables, stock_fetcher.fetch_quotes, self._display_symbols(), _QUOTE_PERIOD, _QUOTE_TTL)
+        if "plot" in pending:
+            self._request_refresh(("plot",), stock_fetcher.fetch_plot, list(self.watchlist_symbols), _PLOT_PERIOD)
+
+    def _request_refresh(self, targets, fetch_fn, symbols, period, ttl=None):
+        """
+        Downloads data for tables or the plot on a worker thread.
+        The result is applied by _apply_refresh on the GUI thread.
+
+        Args:
+            targets (tuple): What to refresh with the result: "watchlist", "portfolio" and/or "plot".
+            fetch_fn (callable): The stock_fetcher method to run, called as fetch_fn(symbols, period, ttl).
+            symbols (list): The symbols to fetch.
+            period (str): The period to fetch (e.g., "1d", "1mo").
+            ttl (float): Maximum age in seconds of a cached download, or None for the period's default.
+        """
+        self._next_request_id += 1
+        request_id = self._next_request_id
+        for target in targets:
+            self._refresh_ids[target] = request_id
+        worker = FetchWorker((targets, request_id), fetch_fn, symbols, period, ttl)
+        worker.signals.finished.connect(self._apply_refresh)
+        worker.signals.failed.connect(self._on_refresh_failed)
+        self.pool.start(worker)
+
+    def _apply_refresh(self, tag, result):
+        """
+        Applies downloaded data to its table or the plot.
+        Results of a request that was superseded by a newer one are ignored.
+
+        Args:
+            tag (tuple): (targets, request id) given to _request_refresh.
+            result (dict): Data returned by the fetch function, keyed by symbol.
+        """
+        targets, request_id = tag
+        for target in targets:
+            if request_id != self._refresh_ids.get(target):
+                continue # A newer refresh of this target is on its way
+            if target == "watchlist":
+                self._apply_watchlist_table(result)
+            elif target == "portfolio":
+                self._apply_portfolio_table(result)
+            elif target == "plot":
+                self._apply_plot(result)
+
+    def _on_refresh_failed(self, tag, error):
+        """
+        Reports a failed background refresh.
+        """
+        print(f"Error refreshing {', '.join(tag[0])}: {error}") # Console notification
 
     def update_watchlist_table(self):
         """
-        Updates the watchlist table with current data for each symbol.
-        Fetches latest price data and updates the table rows.
-        """
-        self.watchlist_table.setRowCount(0) # Clear existing rows
-        # Updated column count and headers
-        self.watchlist_table.setColumnCount(8)
-        self.watchlist_table.setHorizontalHeaderLabels(["Stock", "Open", "High", "Low", "Close", "Buy", "Owned", " "])
-
-        for symbol in self.watchlist_symbols:
-            row_position = self.watchlist_table.rowCount() # Get the current row count
-            self.watchlist_table.insertRow(row_position) # Insert a new row
-
-            # Initialize price strings to N/A
-            open_price_str = "N/A"
-            high_price_str = "N/A"
-            low_price_str = "N/A"
-            close_price_str = "N/A"
-            owned = symbol in self.portfolio  # Check if the stock is owned
-
-            try:
-                # Fetch 1 day of data for the symbol
-                data = stock_fetcher.fetch(symbol, period="1d")
-                if not data.empty:
-                    latest = data.iloc[-1] # Get the latest data row
-                    # Safely get price data, handling potential MultiIndex
-                    open_price = latest.get(('Open', symbol))
-                    high_price = latest.get(('High', symbol))
-                    low_price = latest.get(('Low', symbol))
-                    close_price = latest.get(('Close', symbol))
-
-                    # Format prices if available and not NaN
-                    if pd.notna(open_price):
-                        open_price_str = f"{open_price:.2f}"
-                    if pd.notna(high_price):
-                        high_price_str = f"{high_price:.2f}"
-                    if pd.notna(low_price):
-                        low_price_str = f"{low_price:.2f}"
-                    if pd.notna(close_price):
-                        close_price_str = f"{close_price:.2f}"
-
-            except Exception as e:
-                print(f"Error processing watchlist data for {symbol}: {e}")
-
-            # Set table items with fetched data
-            self.watchlist_table.setItem(row_position, 0, QTableWidgetItem(symbol))
-            self.watchlist_table.setItem(row_position, 1, QTableWidgetItem(open_price_str))
-            self.watchlist_table.setItem(row_position, 2, QTableWidgetItem(high_price_str))
-            self.watchlist_table.setItem(row_position, 3, QTableWidgetItem(low_price_str))
-            self.watchlist_table.setItem(row_position, 4, QTableWidgetItem(close_price_str))
-
-            # Add Buy button
-            buy_button = QPushButton("Buy")
-            # Connect button click to buy_stock_from_watchlist method using a lambda
-            buy_button.clicked.connect(lambda _, s=symbol: self.buy_stock_from_watchlist(s))
-            self.watchlist_table.setCellWidget(row_position, 5, buy_button) # Add button to cell (now column 5)
-
-            # Add Owned indicator
-            owned_indicator = QTableWidgetItem("Yes" if owned else "No")
-            if owned:
-                # Set text color to green if owned
-                owned_indicator.setForeground(QBrush(QColor("green")))
-            else:
-                # Set text color to red if not owned
-                owned_indicator.setForeground(QBrush(QColor("red")))
-            owned_indicator.setTextAlignment(4 | 12)  # Center Alignment (AlignHCenter | AlignVCenter)
-            self.watchlist_table.setItem(row_position, 6, owned_indicator) # Add indicator to cell (now column 6)
-
-            # Add Remove button (now an 'X')
-            remove_button = QPushButton("X") # Changed button text to "X"
-            # Connect button click to remove_from_watchlist method using a lambda
-            remove_button.clicked.connect(lambda _, s=symbol: self.remove_from_watchlist(s))
-            if owned:
-                # Disable remove button if the stock is owned
-                remove_button.setEnabled(False)
-                remove_button.setStyleSheet("color: gray;") # Grey out the button
-            self.watchlist_table.setCellWidget(row_position, 7, remove_button) # Add button to cell (now column 7)
+        Refreshes the watchlist table.
+        Latest price data for all displayed symbols is fetched in the background, in one request.
+        """
+        self._schedule_refresh({"watchlist"})
+
+    def _apply_watchlist_table(self, quotes):
+        """
+        Fills the watchlist table from fetched data.
+        The model updates the rows that stay in place and only inserts or removes the rows of
+        added or removed symbols.
+
+        Args:
+            quotes (dict): {symbol: [open, high, low, close]} from stock_fetcher.fetch_quotes.
+        """
+        # fetch_quotes returns the same dict for as long as the download is unchanged, so with
+        # the same symbols and holdings there is nothing to update
+        table_key = (tuple(self.watchlist_symbols), tuple(self.portfolio), id(quotes))
+        if table_key == self._watchlist_key:
+            return
+        self._watchlist_key = table_key
+        self._watchlist_quotes = quotes # Keeps id(quotes) from being reused by another object
+
+        # Latest prices of every row as one (rows x 4) array; missing symbols show N/A
+        prices = np.array([quotes.get(symbol, _NO_QUOTE) for symbol in self.watchlist_symbols],
+                          dtype=np.float64).reshape(-1, len(QUOTE_FIELDS))
+        texts = _format_prices(prices).tolist()
+        rows = [
+            [symbol, *price_texts, symbol in self.portfolio] # Owned; also disables the remove button
+            for symbol, price_texts in zip(self.watchlist_symbols, texts)
+        ]
+        self.watchlist_model.set_rows(rows)
+
+    def _on_buy_clicked(self, row):
+        """
+        Handles a click on the Buy button of a watchlist row.
+        """
+        self.buy_stock_from_watchlist(self.watchlist_model.symbol_at(row))
+
+    def _on_remove_clicked(self, row):
+        """
+        Handles a click on the remove button of a watchlist row.
+        """
+        self.remove_from_watchlist(self.watchlist_model.symbol_at(row))
 
+    def _on_sell_clicked(self, row):
+        """
+        Handles a click on the Sell button of a portfolio row.
+        """
+        self.sell_stock(self.portfolio_model.symbol_at(row))
 
     def remove_from_watchlist(self, symbol):
         """
@@ -263,10 +596,10 @@ class MarketDataTab(QWidget):
             symbol (str): The symbol of the stock to remove.
         """
         # Check if the symbol is in the watchlist and NOT in the portfolio
-        if symbol in self.watchlist_symbols and symbol not in self.portfolio:
+        if symbol in self._watchlist_set and symbol not in self.portfolio:
             self.watchlist_symbols.remove(symbol) # Remove from the watchlist list
-            self.update_watchlist_table() # Update the watchlist table display
-            self.plot_stocks() # Update the plot
+            self._watchlist_set.discard(symbol)
+            self._schedule_refresh({"watchlist", "plot"}) # Update the watchlist table and the plot
 
     def buy_stock_from_search(self):
         """
@@ -285,6 +618,8 @@ class MarketDataTab(QWidget):
         Args:
             symbol (str): The symbol of the stock to buy.
         """
+        if symbol in self._trades_in_flight:
+            return # A trade of this stock is already waiting for its price
         # Open an input dialog to get the quantity to buy
         quantity, ok = QInputDialog.getInt(self, "Buy Stock", f"Enter quantity for {symbol}:", 1, 1, 10000, 1)
         if ok: # If the user clicked OK
@@ -293,7 +628,8 @@ class MarketDataTab(QWidget):
     def _execute_buy(self, symbol, quantity, from_watchlist=False):
         """
         Executes the stock buying logic.
-        Validates input, checks funds, updates portfolio and cash.
+        Validates input and fetches the current price in the background; funds are checked and
+        the portfolio and cash updated by _on_buy_price once the price arrives.
 
         Args:
             symbol (str): The stock ticker symbol.
@@ -304,10 +640,64 @@ class MarketDataTab(QWidget):
             # Show warning if no symbol is entered
             QMessageBox.warning(self, "Invalid Input", "Please enter a stock symbol to buy.")
             return
+        if symbol in self._trades_in_flight:
+            return # A trade of this stock is already waiting for its price
 
+        self._start_trade(("buy", symbol, quantity), self._on_buy_price)
+
+    def _start_trade(self, tag, on_price):
+        """
+        Fetches 1 day of data for a buy or sell on a worker thread.
+        The Buy Stock button stays disabled until every pending trade got its price.
+
+        Args:
+            tag (tuple): (action, symbol, quantity), passed back to on_price.
+            on_price (callable): Slot completing the trade, called as on_price(tag, data).
+        """
+        symbol = tag[1]
+        self._trades_in_flight.add(symbol)
+        self.buy_search_button.setEnabled(False)
+        # Fetch 1 day of data to get the current price; a short ttl so a retried trade gets a fresh one
+        worker = FetchWorker(tag, stock_fetcher.fetch, symbol, period="1d", ttl=_TRADE_TTL)
+        worker.signals.finished.connect(on_price)
+        worker.signals.failed.connect(self._on_trade_failed)
+        self.pool.start(worker)
+
+    def _finish_trade(self, symbol):
+        """
+        Marks the trade of a symbol as no longer waiting for its price.
+        """
+        self._trades_in_flight.discard(symbol)
+        self.buy_search_button.setEnabled(not self._trades_in_flight)
+
+    def _on_trade_failed(self, tag, error):
+        """
+        Reports an error raised while fetching the price of a buy or sell.
+        """
+        action, symbol, _ = tag
+        self._finish_trade(symbol)
+        # Show critical error if an unexpected exception occurs during the trade
+        QMessageBox.critical(self, "Error", f"An error occurred while trying to {action} '{symbol}': {error}")
+
+    @staticmethod
+    def _last_close(data, symbol):
+        """
+        Returns the last closing price of a symbol in fetched data, as a plain float, 0.0 if NaN.
+        """
+        closes = data[('Close', symbol)].to_numpy()
+        return float(np.nan_to_num(closes[-1], nan=0.0)) if closes.size else 0.0
+
+    def _on_buy_price(self, tag, data):
+        """
+        Completes a buy once its price was fetched: checks funds, updates portfolio and cash.
+
+        Args:
+            tag (tuple): ("buy", symbol, quantity) given to _start_trade.
+            data (DataFrame): 1 day of data for the symbol.
+        """
+        _, symbol, quantity = tag
+        self._finish_trade(symbol)
         try:
-            # Fetch 1 day of data to get the current price
-            data = stock_fetcher.fetch(symbol, period="1d")
             if data.empty:
                 # Show warning if ticker is not found or data is unavailable
                 QMessageBox.warning(self, "Invalid Ticker", f"Stock ticker '{symbol}' not found or data unavailable.")
@@ -318,32 +708,24 @@ class MarketDataTab(QWidget):
                 QMessageBox.warning(self, "Invalid Data", f"Could not retrieve closing price for '{symbol}'.")
                 return
 
-            # Get the last closing price, handling potential MultiIndex and NaN
-            last_close = data[('Close', symbol)].iloc[-1]
-            if isinstance(last_close, pd.Series):
-                last_close = last_close.squeeze() # Convert Series to scalar if necessary
-            try:
-                # Convert price to float, default to 0.0 if NaN or conversion fails
-                price = float(last_close) if pd.notna(last_close) else 0.0
-            except (ValueError, TypeError):
-                # Show warning if price cannot be parsed
-                QMessageBox.warning(self, "Invalid Price", f"Could not parse price for '{symbol}'.")
-                return
+            price = self._last_close(data, symbol) # Get the last closing price
 
             total_cost = price * quantity # Calculate the total cost of the purchase
             # Check if the user has enough simulated cash
             if self.settings_tab.simulated_cash >= total_cost:
                 self.settings_tab.simulated_cash -= total_cost # Deduct cost from cash
-                # Update the cash input display in the settings tab
-                self.settings_tab.cash_input.setValue(self.settings_tab.simulated_cash)
+                # Update the cash input display in the settings tab. Its valueChanged signal is blocked:
+                # the cash is already set and the refresh below would otherwise be requested twice.
+                with QSignalBlocker(self.settings_tab.cash_input):
+                    self.settings_tab.cash_input.setValue(self.settings_tab.simulated_cash)
                 # Add the purchased quantity to the portfolio
                 self.portfolio[symbol] = self.portfolio.get(symbol, 0) + quantity
+                stock_fetcher.invalidate(symbol) # Show the latest price of the traded stock
                 self.update_portfolio_and_cash() # Update portfolio table and cash display
-                if symbol not in self.watchlist_symbols:
+                if symbol not in self._watchlist_set:
                     # Add the symbol to the watchlist if it wasn't already there
-                    self.watchlist_symbols.append(symbol)
-                self.update_watchlist_table()  # Refresh watchlist to show 'Owned' status
-                self.plot_stocks() # Update the plot
+                    self._append_to_watchlist(symbol)
+                self._schedule_refresh({"watchlist"})  # Refresh watchlist to show 'Owned' status
             else:
                 # Show warning if insufficient funds
                 QMessageBox.warning(self, "Insufficient Funds", "You do not have enough funds.")
@@ -355,11 +737,14 @@ class MarketDataTab(QWidget):
     def sell_stock(self, symbol):
         """
         Handles selling a stock from the portfolio using an input dialog for quantity.
+        The selling price is fetched in the background and the sale completed by _on_sell_price.
 
         Args:
             symbol (str): The symbol of the stock to sell.
         """
         if symbol and symbol in self.portfolio and self.portfolio[symbol] > 0:
+            if symbol in self._trades_in_flight:
+                return # A trade of this stock is already waiting for its price
             # Open an input dialog to get the quantity to sell
             quantity_owned = self.portfolio[symbol]
             quantity_to_sell, ok = QInputDialog.getInt(
@@ -368,135 +753,191 @@ class MarketDataTab(QWidget):
 
             if ok and quantity_to_sell > 0: # If the user clicked OK and entered a valid quantity
                 # Fetch 1 day of data to get the current selling price
-                data = stock_fetcher.fetch(symbol, period="1d")
-                price = 0.0 # Initialize price
-
-                if not data.empty and ('Close', symbol) in data.columns:
-                    # Get the last closing price, handling potential MultiIndex and NaN
-                    last_close = data[('Close', symbol)].iloc[-1]
-                    if isinstance(last_close, pd.Series):
-                        last_close = last_close.squeeze() # Convert Series to scalar if necessary
-                    try:
-                        # Convert price to float, default to 0.0 if NaN or conversion fails
-                        price = float(last_close) if pd.notna(last_close) else 0.0
-                    except (ValueError, TypeError):
-                        price = 0.0 # Set price to 0.0 on conversion error
-
-                # Check if the user has enough shares to sell (already checked by QInputDialog range, but good practice)
-                if self.portfolio.get(symbol, 0) >= quantity_to_sell:
-                    total_sale = price * quantity_to_sell # Calculate the total sale amount
-                    self.portfolio[symbol] -= quantity_to_sell # Deduct sold quantity from portfolio
-                    self.settings_tab.simulated_cash += total_sale # Add sale amount to cash
-                    # Update the cash input display in the settings tab
-                    self.settings_tab.cash_input.setValue(self.settings_tab.simulated_cash)
-                    if self.portfolio[symbol] == 0:
-                        # Remove the symbol from the portfolio if quantity becomes zero
-                        del self.portfolio[symbol]
-                    self.update_portfolio_and_cash() # Update portfolio table and cash display
-                    self.update_watchlist_table()  # Refresh watchlist to update 'Owned' status
-                else:
-                    # This case should ideally not be reached due to QInputDialog range
-                    QMessageBox.warning(self, "Insufficient Shares", "You do not have enough shares to sell.")
+                self._start_trade(("sell", symbol, quantity_to_sell), self._on_sell_price)
         elif symbol not in self.portfolio or self.portfolio[symbol] == 0:
              QMessageBox.information(self, "No Shares", f"You do not own any shares of {symbol} to sell.")
 
+    def _on_sell_price(self, tag, data):
+        """
+        Completes a sale once its price was fetched: updates portfolio and cash.
+
+        Args:
+            tag (tuple): ("sell", symbol, quantity) given to _start_trade.
+            data (DataFrame): 1 day of data for the symbol.
+        """
+        _, symbol, quantity_to_sell = tag
+        self._finish_trade(symbol)
+        price = 0.0 # Initialize price
+        if not data.empty and ('Close', symbol) in data.columns:
+            price = self._last_close(data, symbol) # Get the last closing price
+
+        # Check if the user still has enough shares to sell (they may have changed while the price was fetched)
+        if self.portfolio.get(symbol, 0) >= quantity_to_sell:
+            total_sale = price * quantity_to_sell # Calculate the total sale amount
+            self.portfolio[symbol] -= quantity_to_sell # Deduct sold quantity from portfolio
+            self.settings_tab.simulated_cash += total_sale # Add sale amount to cash
+            # Update the cash input display in the settings tab. Its valueChanged signal is blocked:
+            # the cash is already set and the refresh below would otherwise be requested twice.
+            with QSignalBlocker(self.settings_tab.cash_input):
+                self.settings_tab.cash_input.setValue(self.settings_tab.simulated_cash)
+            if self.portfolio[symbol] == 0:
+                # Remove the symbol from the portfolio if quantity becomes zero
+                del self.portfolio[symbol]
+            stock_fetcher.invalidate(symbol) # Show the latest price of the traded stock
+            self.update_portfolio_and_cash() # Update portfolio table and cash display
+            self._schedule_refresh({"watchlist"})  # Refresh watchlist to update 'Owned' status
+        else:
+            QMessageBox.warning(self, "Insufficient Shares", "You do not have enough shares to sell.")
+
 
     def update_portfolio_and_cash(self):
         """
         Updates the portfolio table and the cash display in the settings tab.
         Also triggers a plot update.
         """
-        self.update_portfolio_table() # Update the portfolio table
-        self.plot_stocks() # Update the plot
+        self._schedule_refresh({"portfolio", "plot"}) # Update the portfolio table and the plot
         # Update the cash available label in the market data tab
         self.cash_label.setText(f"Cash Available: ${self.settings_tab.simulated_cash:.2f}")
 
 
     def update_portfolio_table(self):
         """
-        Updates the portfolio table with the current holdings and calculates total value.
-        Removed the "Sell Qty" column.
+        Refreshes the portfolio table and total value.
+        Prices are fetched in the background, with the same request as the watchlist table.
+        """
+        self._schedule_refresh({"portfolio"})
+
+    def _apply_portfolio_table(self, quotes):
         """
-        self.stock_table.setRowCount(0) # Clear existing rows
-        # Updated column count and headers (removed "Sell Qty")
-        self.stock_table.setColumnCount(5)
-        self.stock_table.setHorizontalHeaderLabels(["Stock", "Price", "Quantity", "Value", "Sell"])
-        stock_value = 0.0 # Initialize total stock value
-
-        for symbol, quantity in self.portfolio.items():
-            # Fetch 1 day of data for the symbol to get the current price
-            data = stock_fetcher.fetch(symbol, period="1d")
-            price = 0.0 # Initialize price
-
-            if not data.empty and ('Close', symbol) in data.columns:
-                # Get the last closing price, handling potential MultiIndex and NaN
-                last_close = data[('Close', symbol)].iloc[-1]
-                if isinstance(last_close, pd.Series):
-                    last_close = last_close.squeeze() # Convert Series to scalar if necessary
-                try:
-                    # Convert price to float, default to 0.0 if NaN or conversion fails
-                    price = float(last_close) if pd.notna(last_close) else 0.0
-                except (ValueError, TypeError):
-                    price = 0.0 # Set price to 0.0 on conversion error
-
-            value = price * quantity # Calculate the value of the holding
-            stock_value += value # Add to the total stock value
-
-            row_position = self.stock_table.rowCount() # Get the current row count
-            self.stock_table.insertRow(row_position) # Insert a new row
-            # Set table items with holding details
-            self.stock_table.setItem(row_position, 0, QTableWidgetItem(symbol))
-            self.stock_table.setItem(row_position, 1, QTableWidgetItem(f"{price:.2f}"))
-            self.stock_table.setItem(row_position, 2, QTableWidgetItem(str(quantity)))
-            self.stock_table.setItem(row_position, 3, QTableWidgetItem(f"${value:.2f}"))
-
-            # Add Sell button (now in column 4)
-            sell_button = QPushButton("Sell")
-            # Connect button click to sell_stock method using a lambda, passing only the symbol
-            sell_button.clicked.connect(lambda _, s=symbol: self.sell_stock(s))
-            self.stock_table.setCellWidget(row_position, 4, sell_button) # Add button to 'Sell' column
+        Fills the portfolio table with the current holdings and calculates total value.
+        Removed the "Sell Qty" column.
+        Like the watchlist, rows that stay are updated in place and only the rows of bought or
+        sold off holdings are inserted or removed.
 
+        Args:
+            quotes (dict): {symbol: [open, high, low, close]} from stock_fetcher.fetch_quotes.
+        """
+        # Same holdings and same quotes as last time: only the cash part of the total can differ
+        table_key = (tuple(self.portfolio.items()), id(quotes))
+        if table_key != self._portfolio_key:
+            self._portfolio_key = table_key
+            self._portfolio_quotes = quotes # Keeps id(quotes) from being reused by another object
+            self._stock_value = self._fill_portfolio_rows(quotes)
 
         # Calculate total portfolio value (stocks + cash)
-        total_portfolio_value = stock_value + self.settings_tab.simulated_cash
+        total_portfolio_value = self._stock_value + self.settings_tab.simulated_cash
         # Update the total portfolio value label text
         self.portfolio_label.setText(f"Total Portfolio Value: ${total_portfolio_value:.2f}")
 
+    def _fill_portfolio_rows(self, quotes):
+        """
+        Computes the value of every holding and hands the rows to the portfolio model.
+
+        Args:
+            quotes (dict): {symbol: [open, high, low, close]} from stock_fetcher.fetch_quotes.
+
+        Returns:
+            float: The total value of all holdings.
+        """
+        symbols = list(self.portfolio)
+        quantities = np.fromiter(self.portfolio.values(), dtype=np.float64, count=len(symbols))
+        # Last closing price of every holding, 0.0 if missing or NaN
+        prices = np.nan_to_num(
+            np.array([quotes.get(symbol, _NO_QUOTE)[3] for symbol in symbols], dtype=np.float64), nan=0.0)
+        values = prices * quantities # Value of every holding in one operation
+        stock_value = float(values.sum()) # Total stock value
+
+        # Format every price and value in bulk, so the row loop only assembles strings
+        price_texts = np.char.mod("%.2f", prices).tolist()
+        value_texts = np.char.mod("$%.2f", values).tolist()
+        rows = [
+            [symbol, price_text, str(quantity), value_text]
+            for symbol, quantity, price_text, value_text
+            in zip(symbols, self.portfolio.values(), price_texts, value_texts)
+        ]
+        self.portfolio_model.set_rows(rows)
+        return stock_value
 
     def plot_stocks(self):
+        """
+        Refreshes the plot. One month of data for the watchlist is fetched in the background.
+        """
+        self._schedule_refresh({"plot"})
+
+    def _apply_plot(self, closes):
         """
         Plots the closing prices of the stocks in the watchlist for the last month.
-        Uses the integrated matplotlib canvas.
+        Uses the integrated matplotlib canvas. Existing lines are updated in place;
+        lines are only created or removed when a symbol enters or leaves the plot.
+        Nothing is redrawn when neither the watchlist nor the downloaded data changed.
+
+        Args:
+            closes (dict): {symbol: (x, y)} plot arrays from stock_fetcher.fetch_plot.
         """
-        self.ax.clear() # Clear the previous plot
-        today = pd.Timestamp.today() # Get today's date
-        one_month_ago = today - pd.DateOffset(months=1) # Calculate date one month ago
+        # fetch_plot returns the same arrays object for as long as the download is unchanged
+        plot_key = (tuple(self.watchlist_symbols), id(closes))
+        if plot_key == self._plot_key:
+            return
+        self._plot_key = plot_key
+        self._plotted_closes = closes # Keeps id(closes) from being reused by another object
+
+        # Only plot symbols still in the watchlist, in watchlist order
+        closes = {symbol: closes[symbol] for symbol in self.watchlist_symbols if symbol in closes}
+
+        lines_changed = False
+        # Remove the lines of symbols that are no longer plotted
+        for symbol in [s for s in self._lines if s not in closes]:
+            self._lines.pop(symbol).remove()
+            lines_changed = True
+        for symbol, (x, y) in closes.items():
+            line = self._lines.get(symbol)
+            if line is None:
+                # Plot the closing price for a newly added symbol
+                # Animated lines are left out of full draws and drawn by _draw_lines, so that a
+                # data-only update can blit them over the saved background
+                self._lines[symbol], = self.ax.plot(x, y, label=symbol, animated=True)
+                lines_changed = True
+            else:
+                line.set_data(x, y) # Reuse the existing line
 
+        old_title = self.ax.get_title()
         if not self.watchlist_symbols:
             # Display a message if no stocks are being tracked
             self.ax.set_title("No stocks being tracked.")
         else:
-            for symbol in self.watchlist_symbols:
-                # Fetch 1 month of data for each symbol
-                data = stock_fetcher.fetch(symbol, period="1mo")
-                # Check if data is not empty and contains the closing price for the symbol
-                if not data.empty and ('Close', symbol) in data.columns:
-                    data.index = pd.to_datetime(data.index) # Ensure index is datetime
-                    data = data.sort_index() # Sort data by date
-                    # Filter data for the last month
-                    recent_data = data[(data.index >= one_month_ago) & (data.index <= today)]
-
-                    if not recent_data.empty:
-                        # Plot the closing price for the symbol
-                        self.ax.plot(recent_data.index, recent_data[('Close', symbol)], label=symbol)
-
             self.ax.set_title("Stock Closing Prices (Last Month)") # Set plot title
-            self.ax.set_xlabel("Date") # Set x-axis label
-            self.ax.set_ylabel("Closing Price") # Set y-axis label
-            self.ax.legend() # Show legend with stock symbols
-            self.ax.grid(True) # Add grid
-            self.figure.autofmt_xdate() # Auto-format x-axis dates
-            self.ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d')) # Format dates
-            self.ax.xaxis.set_major_locator(mdates.AutoDateLocator()) # Auto-locate date ticks
-
-        self.canvas.draw() # Redraw the canvas to show the updated plot
+
+        if lines_changed:
+            # Rebuild the legend only when the set of plotted symbols changed
+            if self._lines:
+                self.ax.legend() # Show legend with stock symbols
+            elif self.ax.get_legend() is not None:
+                self.ax.get_legend().remove()
+
+        old_limits = (self.ax.get_xlim(), self.ax.get_ylim())
+        self.ax.relim() # Fit the axes to the updated lines
+        self.ax.autoscale_view()
+        if (lines_changed or self._plot_background is None or self.ax.get_title() != old_title
+                or (self.ax.get_xlim(), self.ax.get_ylim()) != old_limits):
+            # Axes, ticks, title or legend changed: redraw the canvas once control returns to the event loop
+            self.canvas.draw_idle()
+        else:
+            # Only the data changed: redraw just the lines over the saved background
+            self.canvas.restore_region(self._plot_background)
+            self._draw_lines()
+            self.canvas.blit(self.figure.bbox)
+
+    def _on_canvas_draw(self, event):
+        """
+        Saves the freshly drawn figure, which excludes the animated lines, as the background
+        for blitting, then draws the lines on top.
+        """
+        self._plot_background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_lines()
+
+    def _draw_lines(self):
+        """
+        Draws the plotted lines onto the canvas renderer.
+        """
+        for line in self._lines.values():
+            self.ax.draw_artist(line)
@@ -0,0 +1,34 @@
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPalette
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyleOptionViewItem
+
+# Item data role under which a model returns every role its cell paints with, as {role: value}
+MULTIPLE_ROLES = Qt.UserRole + 1
+
+class MultipleRolesDelegate(QStyledItemDelegate):
+    """
+    Paints text cells with a single data() call per cell.
+    The default delegate asks the model for the display text, font, colors, alignment, check state
+    and icon separately, each a call into Python. This delegate asks once for MULTIPLE_ROLES and
+    fills the style option from the returned dict. Models that do not answer MULTIPLE_ROLES are
+    painted the default way.
+    """
+    def initStyleOption(self, option, index):
+        """
+        Fills the style option from the cell's MULTIPLE_ROLES data.
+        """
+        roles = index.data(MULTIPLE_ROLES)
+        if roles is None:
+            super().initStyleOption(option, index)
+            return
+        option.index = index
+        text = roles.get(Qt.DisplayRole)
+        if text is not None:
+            option.text = text
+            option.features |= QStyleOptionViewItem.HasDisplay
+        alignment = roles.get(Qt.TextAlignmentRole)
+        if alignment is not None:
+            option.displayAlignment = Qt.Alignment(alignment)
+        foreground = roles.get(Qt.ForegroundRole)
+        if foreground is not None:
+            option.palette.setBrush(QPalette.Text, foreground)
@@ -1,7 +1,86 @@
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QDoubleSpinBox, QComboBox
+    QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QDoubleSpinBox, QComboBox
 )
 from PyQt5.QtGui import QColor, QBrush, QPalette
+from PyQt5.QtCore import QTimer
+
+# Colors of each theme, applied through the application palette. Palette changes restyle widgets
+# without parsing a stylesheet; roles: (window, text, base, button, disabled text)
+_THEME_COLORS = {
+    "Dark": ("#363636", "#f0f0f0", "#4a4a4a", "#555", "#999"),
+    "High Contrast": ("black", "yellow", "#333", "#555", "#998f00"),
+    "Blackout": ("black", "#ccc", "#222", "#333", "#777"),
+}
+
+# Stylesheets for each theme, built once at import time. They only cover what the palette
+# cannot express: borders, padding, the tab bar and pane, hover colors and the header sections.
+_THEMES = {
+    "Light": "", # Clear stylesheet for default light theme
+    "Dark": """
+    QTabWidget::pane { background-color: #363636; border: 0px; }
+    QTabBar::tab { background-color: #555; padding: 8px; }
+    QTabBar::tab:selected { background-color: #363636; border-bottom: 2px solid #f0f0f0; }
+    QLineEdit, QSpinBox, QDoubleSpinBox, QComboBox, QTextEdit { border: 1px solid #666; }
+    QTableView { border: 1px solid #666; gridline-color: #666; }
+    QHeaderView::section { background-color: #4a4a4a; color: #f0f0f0; border: 1px solid #666; }
+    QPushButton { background-color: #555; border: 1px solid #777; padding: 5px; }
+    QPushButton:hover { background-color: #666; }
+    QComboBox::drop-down { background-color: #4a4a4a; border: 0px; }
+""",
+    "High Contrast": """
+    QTabWidget::pane { background-color: black; border: 0px; }
+    QTabBar::tab { background-color: #333; padding: 8px; }
+    QTabBar::tab:selected { background-color: black; border-bottom: 2px solid yellow; }
+    QLineEdit, QSpinBox, QDoubleSpinBox, QComboBox, QTextEdit { border: 1px solid yellow; }
+    QTableView { border: 1px solid yellow; gridline-color: yellow; }
+    QHeaderView::section { background-color: #333; color: yellow; border: 1px solid yellow; }
+    QPushButton { background-color: #555; border: 1px solid yellow; padding: 5px; }
+    QPushButton:hover { background-color: #777; color: black; }
+    QComboBox::drop-down { background-color: #333; border: 0px; }
+""",
+    "Blackout": """
+    QTabWidget::pane { background-color: black; border: 0px; }
+    QTabBar::tab { background-color: #222; padding: 8px; }
+    QTabBar::tab:selected { background-color: black; border-bottom: 2px solid #ccc; }
+    QLineEdit, QSpinBox, QDoubleSpinBox, QComboBox, QTextEdit { border: 1px solid #444; }
+    QTableView { border: 1px solid #444; gridline-color: #444; }
+    QHeaderView::section { background-color: #222; color: #ccc; border: 1px solid #444; }
+    QPushButton { background-color: #333; border: 1px solid #555; padding: 5px; }
+    QPushButton:hover { background-color: #444; }
+    QComboBox::drop-down { background-color: #222; border: 0px; }
+""",
+}
+
+_PALETTES = {} # Palette per theme, built on first use (a QApplication must exist by then)
+
+def _theme_palette(theme):
+    """
+    Returns the application palette of a theme.
+
+    Args:
+        theme (str): The theme name.
+
+    Returns:
+        QPalette: The theme's palette; the style's standard palette for "Light".
+    """
+    palette = _PALETTES.get(theme)
+    if palette is None:
+        palette = QApplication.style().standardPalette() # Default light colors
+        colors = _THEME_COLORS.get(theme)
+        if colors is not None:
+            window, text, base, button, disabled_text = (QColor(color) for color in colors)
+            # Backgrounds are the same in every color group
+            for role, color in ((QPalette.Window, window), (QPalette.Base, base),
+                                (QPalette.AlternateBase, base), (QPalette.Button, button),
+                                (QPalette.ToolTipBase, base)):
+                palette.setColor(role, color)
+            # Text is dimmed for disabled widgets, so e.g. a disabled button still looks disabled
+            for role in (QPalette.WindowText, QPalette.Text, QPalette.ButtonText, QPalette.ToolTipText):
+                palette.setColor(QPalette.Active, role, text)
+                palette.setColor(QPalette.Inactive, role, text)
+                palette.setColor(QPalette.Disabled, role, disabled_text)
+        _PALETTES[theme] = palette
+    return palette
 
 class SettingsTab(QWidget):
     """
@@ -17,6 +96,12 @@ class SettingsTab(QWidget):
         super().__init__()
         self.main_window = main_window # Reference to the main window for applying themes
         self.simulated_cash = 500.0 # Initial simulated cash
+        # Cash edits in quick succession (typing, holding an arrow) update the market tab once,
+        # 150 ms after the last change
+        self._cash_timer = QTimer(self)
+        self._cash_timer.setSingleShot(True)
+        self._cash_timer.setInterval(150)
+        self._cash_timer.timeout.connect(self._commit_cash)
         self.init_ui() # Initialize the user interface
 
     def init_ui(self):
@@ -54,14 +139,19 @@ class SettingsTab(QWidget):
 
     def set_cash(self, value):
         """
-        Sets the simulated cash amount and updates the display in MarketDataTab.
+        Sets the simulated cash amount and schedules an update of the display in MarketDataTab.
 
         Args:
             value (float): The new simulated cash amount.
         """
         self.simulated_cash = value # Update the simulated cash value
         # The cash_input widget is already updated automatically by the spin box
-        # When cash is changed in settings, update the display in MarketDataTab
+        self._cash_timer.start() # (Re)start the wait for further changes
+
+    def _commit_cash(self):
+        """
+        Updates the display in MarketDataTab once the cash amount stopped changing.
+        """
         # Access the market_tab through the main_window reference
         if hasattr(self.main_window, 'market_tab'):
              self.main_window.market_tab.update_portfolio_and_cash()
@@ -69,75 +159,12 @@ class SettingsTab(QWidget):
 
     def apply_theme(self, index):
         """
-        Applies the selected theme to the main window and its widgets using stylesheets.
+        Applies the selected theme: its colors through the application palette, the rest
+        through a short stylesheet on the main window.
 
         Args:
             index (int): The index of the selected theme in the combo box.
         """
         theme = self.theme_combo.itemText(index) # Get the selected theme name
-        if theme == "Light":
-            # Clear stylesheet for default light theme
-            self.main_window.setStyleSheet("")
-        elif theme == "Dark":
-            # Dark theme stylesheet
-            self.main_window.setStyleSheet("""
-                QMainWindow { background-color: #363636; color: #f0f0f0; }
-                QTabWidget::pane { background-color: #363636; color: #f0f0f0; }
-                QTabBar::tab { background-color: #555; color: #f0f0f0; padding: 8px; }
-                QTabBar::tab:selected { background-color: #363636; border-bottom: 2px solid #f0f0f0; }
-                QWidget { background-color: #363636; color: #f0f0f0; }
-                QLineEdit { background-color: #4a4a4a; color: #f0f0f0; border: 1px solid #666; }
-                QSpinBox { background-color: #4a4a4a; color: #f0f0f0; border: 1px solid #666; }
-                QDoubleSpinBox { background-color: #4a4a4a; color: #f0f0f0; border: 1px solid #666; }
-                QTableWidget { background-color: #4a4a4a; color: #f0f0f0; border: 1px solid #666; gridline-color: #666; }
-                QHeaderView::section { background-color: #4a4a4a; color: #f0f0f0; border: 1px solid #666; } /* Added styling for header sections */
-                QPushButton { background-color: #555; color: #f0f0f0; border: 1px solid #777; padding: 5px; }
-                QPushButton:hover { background-color: #666; }
-                QComboBox { background-color: #4a4a4a; color: #f0f0f0; border: 1px solid #666; }
-                QComboBox::drop-down { background-color: #4a4a4a; border: 0px; }
-                QComboBox::down-arrow { color: #f0f0f0; }
-                QLabel { color: #f0f0f0; }
-                QTextEdit { background-color: #4a4a4a; color: #f0f0f0; border: 1px solid #666; } /* Added styling for QTextEdit */
-            """)
-        elif theme == "High Contrast":
-            # High Contrast theme stylesheet
-            self.main_window.setStyleSheet("""
-                QMainWindow { background-color: black; color: yellow; }
-                QTabWidget::pane { background-color: black; color: yellow; }
-                QTabBar::tab { background-color: #333; color: yellow; padding: 8px; }
-                QTabBar::tab:selected { background-color: black; border-bottom: 2px solid yellow; }
-                QWidget { background-color: black; color: yellow; }
-                QLineEdit { background-color: #333; color: yellow; border: 1px solid yellow; }
-                QSpinBox { background-color: #333; color: yellow; border: 1px solid yellow; }
-                QDoubleSpinBox { background-color: #333; color: yellow; border: 1px solid yellow; }
-                QTableWidget { background-color: #333; color: yellow; border: 1px solid yellow; gridline-color: yellow; }
-                QHeaderView::section { background-color: #333; color: yellow; border: 1px solid yellow; } /* Added styling for header sections */
-                QPushButton { background-color: #555; color: yellow; border: 1px solid yellow; padding: 5px; }
-                QPushButton:hover { background-color: #777; color: black; }
-                QComboBox { background-color: #333; color: yellow; border: 1px solid yellow; }
-                QComboBox::drop-down { background-color: #333; border: 0px; }
-                QComboBox::down-arrow { color: yellow; }
-                QLabel { color: yellow; }
-                QTextEdit { background-color: #333; color: yellow; border: 1px solid yellow; } /* Added styling for QTextEdit */
-            """)
-        elif theme == "Blackout":
-            # Blackout theme stylesheet
-            self.main_window.setStyleSheet("""
-                QMainWindow { background-color: black; color: #ccc; }
-                QTabWidget::pane { background-color: black; color: #ccc; }
-                QTabBar::tab { background-color: #222; color: #ccc; padding: 8px; }
-                QTabBar::tab:selected { background-color: black; border-bottom: 2px solid #ccc; }
-                QWidget { background-color: black; color: #ccc; }
-                QLineEdit { background-color: #222; color: #ccc; border: 1px solid #444; }
-                QSpinBox { background-color: #222; color: #ccc; border: 1px solid #444; }
-                QDoubleSpinBox { background-color: #222; color: #ccc; border: 1px solid #444; }
-                QTableWidget { background-color: #222; color: #ccc; border: 1px solid #444; gridline-color: #444; }
-                QHeaderView::section { background-color: #222; color: #ccc; border: 1px solid #444; } /* Added styling for header sections */
-                QPushButton { background-color: #333; color: #ccc; border: 1px solid #555; padding: 5px; }
-                QPushButton:hover { background-color: #444; }
-                QComboBox { background-color: #222; color: #ccc; border: 1px solid #444; }
-                QComboBox::drop-down { background-color: #222; border: 0px; }
-                QComboBox::down-arrow { color: #ccc; }
-                QLabel { color: #ccc; }
-                QTextEdit { background-color: #222; color: #ccc; border: 1px solid #444; } /* Added styling for QTextEdit */
-            """)
+        QApplication.instance().setPalette(_theme_palette(theme))
+        self.main_window.setStyleSheet(_THEMES.get(theme, ""))
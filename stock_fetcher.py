@@ -1,30 +1,523 @@
-import yfinance as yf
+import datetime
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
+import matplotlib.dates as mdates
+
+# Downloads are also saved here so a restart can skip the network for data fetched earlier the same day
+_DISK_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".wsbgpt", "cache")
+
+# Default seconds a result stays valid per period. Longer periods change less often relative to
+# their length; callers needing fresher data (the tables, trades, auto trading) pass their own ttl.
+_PERIOD_TTLS = {"1d": 300, "1mo": 3600}
+
+# Most symbols requested from Yahoo in one download; longer lists are split into several downloads
+_BATCH_SIZE = 20
+
+# Threads for downloads that run side by side. Created once so each use skips thread start-up;
+# the requests are network bound, so the threads overlap their waiting time.
+_IO_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="stock_fetcher")
+
+# Prices returned by fetch_quotes, in array order
+QUOTE_FIELDS = ("Open", "High", "Low", "Close")
 
 class StockFetcher:
     """
     Fetches stock data from yfinance.
+    Results are cached per (symbols, period) so the tables, the plot and repeated user
+    actions reuse one download instead of each hitting the network.
     """
-    def fetch(self, symbol, period="1mo"):
+    def __init__(self, ttl=30, disk_cache_dir=_DISK_CACHE_DIR, max_entries=256, period_ttls=None):
+        """
+        Initializes the StockFetcher.
+
+        Args:
+            ttl (float): Default number of seconds a fetched result stays valid, for periods
+                without an entry in period_ttls. Callers that need fresher data pass their own ttl to fetch().
+            disk_cache_dir (str): Directory for the parquet disk cache, or None to disable it.
+                Disk entries are used at most once per key and process, only on the day they were
+                written, and count as fetched when they were written. "1d" data (the latest prices)
+                is never cached on disk. Files from earlier days and beyond max_entries are deleted.
+            max_entries (int): Most results kept in memory; the least recently used are dropped first.
+            period_ttls (dict): Seconds a result stays valid per period, e.g. {"1d": 300}.
+                Defaults to 5 minutes for "1d" and 1 hour for "1mo".
+        """
+        self.ttl = ttl
+        self.period_ttls = dict(_PERIOD_TTLS if period_ttls is None else period_ttls)
+        self.max_entries = max_entries
+        # Recent results, least recently used first: {(symbols, period): (fetch time, DataFrame)}
+        self._cache = OrderedDict()
+        self._lock = threading.Lock() # fetch() is also called from worker threads
+        self._in_flight = {} # Downloads in progress, so concurrent requests share one: {(symbols, period): Future}
+        # Time of the newest download including each symbol, least recently updated first: {(symbol, period): time}
+        self._fetched_at = OrderedDict()
+        # Plot arrays per download, least recently used first: {(symbols, period): (source DataFrame, arrays)}
+        self._plot_cache = OrderedDict()
+        # Quotes per download, least recently used first: {(symbols, period): (source DataFrame, quotes)}
+        self._quotes_cache = OrderedDict()
+        self._disk_cache_dir = disk_cache_dir
+        self._disk_checked = set() # Keys already looked up on disk in this process
+        self._yf = None # yfinance module, imported on the first download
+
+    def fetch(self, symbol, period="1mo", ttl=None):
         """
         Fetches historical stock data for a given symbol and period.
+        Several symbols can be fetched with a single request by passing a list.
 
         Args:
-            symbol (str): The stock ticker symbol.
+            symbol (str or list): The stock ticker symbol, or a list of symbols.
             period (str): The period for which to fetch data (e.g., "1d", "1mo", "1y").
+            ttl (float): Maximum age in seconds of a cached result. Defaults to the period's
+                entry in self.period_ttls, or self.ttl.
 
         Returns:
-            pandas.DataFrame: DataFrame containing the stock data, or empty DataFrame on error.
+            pandas.DataFrame: A copy of the stock data, or empty DataFrame on error.
         """
+        # Callers get their own copy so they can modify it without corrupting the cache
+        return self._fetch_shared(symbol, period, ttl).copy()
+
+    def _fetch_shared(self, symbol, period, ttl=None):
+        """
+        Same as fetch(), but returns the cached DataFrame itself. Callers must not modify it.
+        """
+        if ttl is None:
+            ttl = self.period_ttls.get(period, self.ttl)
+        # The order of a symbol list doesn't change the result, so it doesn't change the key
+        symbols_key = tuple(sorted(symbol)) if isinstance(symbol, (list, tuple, set)) else symbol
+        key = (symbols_key, period)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key) # Mark as recently used
+                if now - cached[0] < ttl and not self._superseded(key, cached[0]):
+                    return cached[1]
+            pending = self._in_flight.get(key)
+            downloading = pending is None
+            if downloading:
+                pending = self._in_flight[key] = Future()
+        if not downloading:
+            # Another thread is already fetching this key; share its result instead of downloading again
+            return pending.result()
+
+        data = pd.DataFrame()
         try:
-            # Fetch data for the specified symbol and period
-            # progress=False suppresses the download progress bar
-            data = yf.download(symbol, period=period, progress=False)
+            data = self._load(symbol, period, key, ttl)
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            pending.set_result(data)
+        return data
+
+    def _load(self, symbol, period, key, ttl):
+        """
+        Loads a key from the disk cache or the network and stores it in the memory cache.
+
+        Returns:
+            pandas.DataFrame: The stock data, or empty DataFrame on error.
+        """
+        now = time.monotonic()
+        saved = self._read_disk_cache(key, ttl)
+        if saved is not None:
+            data, age = saved
+            self._store_download(key, now - age, data) # Keeps the age it had on disk
             return data
+
+        try:
+            if self._yf is None:
+                # yfinance is slow to import, so it is loaded on first use instead of at startup
+                import yfinance
+                self._yf = yfinance
+            if isinstance(symbol, (list, tuple, set)) and len(symbol) > _BATCH_SIZE:
+                data = self._download_in_batches(list(symbol), period)
+            else:
+                # Fetch data for the specified symbol and period
+                # progress=False suppresses the download progress bar. No session is passed: yfinance
+                # keeps one session of its own for every download, and only accepts a curl_cffi one.
+                data = self._yf.download(symbol, period=period, progress=False)
         except Exception as e:
             # Print an error message if data fetching fails
             print(f"Error fetching data for {symbol}: {e}")
             return pd.DataFrame() # Return an empty DataFrame on error
 
+        if not data.empty:
+            if not data.index.is_monotonic_increasing:
+                data = data.sort_index() # Sorted once here, so readers can slice by binary search
+            if period != "1d":
+                # History is only plotted, so float32 is precise enough and halves the cached memory.
+                # "1d" data keeps float64 because its prices are shown in the tables and used for trades.
+                data = data.astype({column: np.float32 for column in data.select_dtypes("float64").columns})
+            self._store_download(key, now, data)
+            self._write_disk_cache(key, data)
+        return data
+
+    def _store_download(self, key, fetched, data):
+        """
+        Adds a download to the memory cache and records when each of its symbols was fetched.
+
+        Args:
+            key (tuple): The (symbols, period) cache key.
+            fetched (float): time.monotonic() at which the data was downloaded.
+            data (pandas.DataFrame): The downloaded data.
+        """
+        self._store(self._cache, key, (fetched, data))
+        period = key[1]
+        with self._lock:
+            for s in self._key_symbols(key):
+                self._fetched_at[(s, period)] = max(fetched, self._fetched_at.get((s, period), fetched))
+                self._fetched_at.move_to_end((s, period))
+            while len(self._fetched_at) > self.max_entries:
+                # Bounded like the caches; the least recently downloaded symbols are forgotten first
+                self._fetched_at.popitem(last=False)
+
+    @staticmethod
+    def _key_symbols(key):
+        """
+        Returns the symbols of a cache key as a tuple.
+        """
+        return key[0] if isinstance(key[0], tuple) else (key[0],)
+
+    def _superseded(self, key, fetched):
+        """
+        Tells whether a symbol of a cached result was downloaded again later, for example as part of
+        a different symbol list. Serving the older result would make that symbol's price go backwards.
+        Must be called with self._lock held.
+        """
+        period = key[1]
+        return any(self._fetched_at.get((s, period), fetched) > fetched for s in self._key_symbols(key))
+
+    def _store(self, cache, key, value):
+        """
+        Adds an entry to one of the in-memory caches, dropping the least recently used
+        entries once it holds more than max_entries.
+        """
+        with self._lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            while len(cache) > self.max_entries:
+                cache.popitem(last=False)
+
+    def _download_in_batches(self, symbols, period):
+        """
+        Downloads a long symbol list as several downloads of at most _BATCH_SIZE symbols.
+
+        Args:
+            symbols (list): The stock ticker symbols.
+            period (str): The period for which to fetch data.
+
+        Returns:
+            pandas.DataFrame: All batches combined, with the same column layout as a single download.
+        """
+        # The batches are downloaded side by side
+        groups = [symbols[start:start + _BATCH_SIZE] for start in range(0, len(symbols), _BATCH_SIZE)]
+        results = _IO_POOL.map(
+            lambda group: self._yf.download(group, period=period, progress=False), groups
+        )
+        batches = [batch for batch in results if not batch.empty]
+        if not batches:
+            return pd.DataFrame()
+        # Join on the dates and keep the columns grouped by field, as yfinance returns them
+        return pd.concat(batches, axis=1).sort_index(axis=1, level=0, sort_remaining=False)
+
+    def _disk_cache_path(self, key):
+        """
+        Returns the parquet file of a cache key, or None if the key is not cached on disk.
+        """
+        if self._disk_cache_dir is None or key[1] == "1d":
+            return None
+        name = hashlib.sha1(repr(key).encode()).hexdigest()[:16] # Short, filesystem safe name
+        return os.path.join(self._disk_cache_dir, f"{name}.parquet")
+
+    def _read_disk_cache(self, key, ttl):
+        """
+        Loads a download saved by an earlier run today, the first time a key is requested.
+
+        Args:
+            key (tuple): The (symbols, period) cache key.
+            ttl (float): Maximum age in seconds of the saved download.
+
+        Returns:
+            tuple: (DataFrame, age in seconds of the file), or None if there is no usable entry.
+        """
+        path = self._disk_cache_path(key)
+        with self._lock:
+            if path is None or key in self._disk_checked:
+                return None
+            self._disk_checked.add(key)
+        try:
+            written = os.path.getmtime(path)
+            if datetime.date.fromtimestamp(written) != datetime.date.today():
+                return None # Saved on an earlier day; today's data must come from the network
+            age = max(0.0, time.time() - written)
+            if age >= ttl:
+                return None # Too old for the caller
+            data = pd.read_parquet(path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            # The disk cache is only an optimization; fall back to the network
+            print(f"Error reading cached data for {key[0]}: {e}")
+            return None
+        return (data, age) if not data.empty else None
+
+    def _write_disk_cache(self, key, data):
+        """
+        Saves a download to the disk cache. Errors are reported and otherwise ignored.
+        """
+        path = self._disk_cache_path(key)
+        if path is None:
+            return
+        try:
+            os.makedirs(self._disk_cache_dir, exist_ok=True)
+            data.to_parquet(path, compression="snappy")
+        except ImportError as e:
+            # Parquet support (pyarrow or fastparquet) is optional
+            print(f"Disk cache disabled: {e}")
+            self._disk_cache_dir = None
+            return
+        except Exception as e:
+            print(f"Error caching data for {key[0]} on disk: {e}")
+        self._prune_disk_cache()
+
+    def _prune_disk_cache(self):
+        """
+        Deletes disk cache files written before today, and the oldest files beyond max_entries.
+        Every symbol list gets its own file, so without this the directory would only grow.
+        """
+        try:
+            files = [entry for entry in os.scandir(self._disk_cache_dir) if entry.name.endswith(".parquet")]
+        except OSError as e:
+            print(f"Error pruning the disk cache: {e}")
+            return
+        today = datetime.date.today()
+        written = []
+        for entry in files:
+            try:
+                written.append((entry.stat().st_mtime, entry.path))
+            except FileNotFoundError:
+                pass # Deleted meanwhile by another thread
+        written.sort(reverse=True) # Newest first
+        for n, (mtime, path) in enumerate(written):
+            if n >= self.max_entries or datetime.date.fromtimestamp(mtime) != today:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    print(f"Error pruning the disk cache: {e}")
+                    return
+
+    def invalidate(self, symbol=None):
+        """
+        Drops cached results so the next fetch goes to the network.
+
+        Args:
+            symbol (str): Only drop results that include this symbol, batched ones included.
+                Drops everything if None.
+        """
+        with self._lock:
+            if symbol is None:
+                self._cache.clear()
+                self._plot_cache.clear()
+                self._quotes_cache.clear()
+                self._fetched_at.clear()
+                return
+            for cache in (self._cache, self._plot_cache, self._quotes_cache):
+                for key in list(cache):
+                    symbols_key = key[0]
+                    if symbols_key == symbol or (isinstance(symbols_key, tuple) and symbol in symbols_key):
+                        del cache[key]
+            for key in [key for key in self._fetched_at if key[0] == symbol]:
+                del self._fetched_at[key]
+
+    def fetch_many(self, symbols, period="1mo", ttl=None):
+        """
+        Fetches data for several symbols with a single batched download.
+        The batch is cached like fetch(), so it shares the cache with any other caller
+        asking for the same symbols and period.
+
+        Args:
+            symbols (list): The stock ticker symbols.
+            period (str): The period for which to fetch data (e.g., "1d", "1mo", "1y").
+            ttl (float): Maximum age in seconds of a cached download, as for fetch().
+
+        Returns:
+            dict: {symbol: DataFrame with Open/High/Low/Close/Volume columns} for every symbol
+                that returned data. Symbols without data are left out.
+        """
+        symbols = list(dict.fromkeys(symbols)) # Drop duplicates, keep order
+        if not symbols:
+            return {}
+        data = self._fetch_shared(symbols, period, ttl) # Slicing below copies, so no extra copy is needed
+        if data.empty:
+            if len(symbols) > 1:
+                # The batched download failed as a whole; fall back to one request per symbol
+                return self.fetch_concurrent(symbols, period, ttl)
+            return {}
+        return self._split_symbols(data, symbols)
+
+    def fetch_quotes(self, symbols, period="1d", ttl=None):
+        """
+        Fetches the latest Open/High/Low/Close of several symbols with a single batched download.
+        The last row of every symbol is extracted in one pandas operation, as plain arrays so
+        callers read the prices by position instead of by column label. The result is computed
+        once per download: until the data is fetched again the same dict is returned, so callers
+        can tell an unchanged result by identity. Callers must not modify it.
+
+        Args:
+            symbols (list): The stock ticker symbols.
+            period (str): The period to download; the quotes come from its last row.
+            ttl (float): Maximum age in seconds of a cached download, as for fetch().
+
+        Returns:
+            dict: {symbol: ndarray} for every symbol that returned data. Each array holds the
+                QUOTE_FIELDS prices in that order; missing values are NaN.
+        """
+        symbols = list(dict.fromkeys(symbols)) # Drop duplicates, keep order
+        if not symbols:
+            return {}
+        key = (tuple(sorted(symbols)), period)
+        data = self._fetch_shared(symbols, period, ttl)
+        with self._lock:
+            cached = self._quotes_cache.get(key)
+            if cached is not None:
+                self._quotes_cache.move_to_end(key) # Mark as recently used
+        if cached is not None and cached[0] is data:
+            return cached[1] # Same download as last time, so the same quotes
+
+        if data.empty:
+            # Per symbol fallback when the batched download failed; not cached here
+            frames = self.fetch_concurrent(symbols, period, ttl) if len(symbols) > 1 else {}
+            return {symbol: frame.iloc[-1].reindex(QUOTE_FIELDS).to_numpy(dtype=np.float64)
+                    for symbol, frame in frames.items()}
+
+        if not isinstance(data.columns, pd.MultiIndex):
+            # Older yfinance versions return flat columns for a single ticker
+            quotes = {}
+            if len(symbols) == 1:
+                quotes[symbols[0]] = data.iloc[-1].reindex(QUOTE_FIELDS).to_numpy(dtype=np.float64)
+        else:
+            # Last row as a (symbol x field) table, then one array row per symbol
+            last = data.iloc[-1].unstack(0)
+            last = last[last.index.isin(symbols)].reindex(columns=QUOTE_FIELDS)
+            quotes = dict(zip(last.index, last.to_numpy(dtype=np.float64)))
+
+        self._store(self._quotes_cache, key, (data, quotes))
+        return quotes
+
+    def fetch_plot(self, symbols, period="1mo", ttl=None):
+        """
+        Fetches the closing prices of several symbols over the last month, ready to plot.
+        The arrays are computed once per download and reused until the data is fetched again.
+
+        Args:
+            symbols (list): The stock ticker symbols.
+            period (str): The period to download; only its last month is returned.
+            ttl (float): Maximum age in seconds of a cached download, as for fetch().
+
+        Returns:
+            dict: {symbol: (x, y)} where x holds matplotlib date numbers (float64) and y the
+                closing prices (float32), for every symbol with data in the last month.
+        """
+        symbols = list(dict.fromkeys(symbols)) # Drop duplicates, keep order
+        if not symbols:
+            return {}
+        key = (tuple(sorted(symbols)), period)
+        data = self._fetch_shared(symbols, period, ttl)
+        with self._lock:
+            cached = self._plot_cache.get(key)
+            if cached is not None:
+                self._plot_cache.move_to_end(key) # Mark as recently used
+        if cached is not None and cached[0] is data:
+            return cached[1] # Same download as last time, so the same arrays
+
+        if data.empty:
+            # Per symbol fallback when the batched download failed; not cached here
+            frames = self.fetch_concurrent(symbols, period, ttl) if len(symbols) > 1 else {}
+            closes = pd.DataFrame({symbol: frame['Close'] for symbol, frame in frames.items()})
+        elif isinstance(data.columns, pd.MultiIndex):
+            closes = data['Close'] # One column per symbol
+        else:
+            # Older yfinance versions return flat columns for a single ticker
+            closes = data[['Close']].set_axis(symbols[:1], axis=1)
+
+        if closes.empty:
+            return {}
+        # Filter data for the last month: two binary searches on the sorted DatetimeIndex give
+        # the row bounds, so no boolean mask or label-based slice is built
+        today = pd.Timestamp.today()
+        one_month_ago = today - pd.DateOffset(months=1)
+        if not closes.index.is_monotonic_increasing:
+            closes = closes.sort_index() # Only the per symbol fallback can be unsorted
+        start = closes.index.searchsorted(one_month_ago, side="left")
+        stop = closes.index.searchsorted(today, side="right")
+        # One column per requested symbol, all-NaN for symbols missing from the download
+        closes = closes.iloc[start:stop].reindex(columns=symbols)
+
+        x = mdates.date2num(closes.index) # Shared by every symbol
+        # All closes in one conversion, one contiguous row per symbol
+        ys = np.ascontiguousarray(closes.to_numpy(dtype=np.float32).T)
+        has_data = ~np.isnan(ys).all(axis=1) if len(x) else np.zeros(len(symbols), dtype=bool)
+        arrays = {symbol: (x, ys[i]) for i, symbol in enumerate(symbols) if has_data[i]}
+
+        if not data.empty:
+            self._store(self._plot_cache, key, (data, arrays))
+        return arrays
+
+    def fetch_concurrent(self, symbols, period="1mo", ttl=None):
+        """
+        Fetches several symbols with one request each, running the requests in parallel on _IO_POOL.
+        Used when a batched download is not available. Each symbol is cached on its own.
+
+        Args:
+            symbols (list): The stock ticker symbols.
+            period (str): The period for which to fetch data (e.g., "1d", "1mo", "1y").
+            ttl (float): Maximum age in seconds of a cached download, as for fetch().
+
+        Returns:
+            dict: {symbol: DataFrame with Open/High/Low/Close/Volume columns} for every symbol
+                that returned data. Symbols without data are left out.
+        """
+        symbols = list(dict.fromkeys(symbols)) # Drop duplicates, keep order
+        if not symbols:
+            return {}
+        frames = {}
+        for symbol, data in _IO_POOL.map(lambda s: (s, self._fetch_shared(s, period, ttl)), symbols):
+            if not data.empty:
+                frames.update(self._split_symbols(data, [symbol]))
+        return frames
+
+    @staticmethod
+    def _split_symbols(data, symbols):
+        """
+        Splits a downloaded DataFrame into one DataFrame per symbol.
+
+        Args:
+            data (pandas.DataFrame): Data as returned by yf.download, not empty.
+            symbols (list): The symbols that were requested.
+
+        Returns:
+            dict: {symbol: DataFrame with Open/High/Low/Close/Volume columns} for every symbol
+                that has data.
+        """
+        if not isinstance(data.columns, pd.MultiIndex):
+            # Older yfinance versions return flat columns for a single ticker
+            return {symbols[0]: data.copy()} if len(symbols) == 1 else {}
+
+        frames = {}
+        tickers = set(data.columns.get_level_values(1))
+        for symbol in symbols:
+            if symbol in tickers:
+                frame = data.xs(symbol, axis=1, level=1) # Columns become Open/High/Low/Close/Volume
+                if not frame["Close"].isna().all():
+                    frames[symbol] = frame
+        return frames
+
 # Global instance to be imported by other modules
-stock_fetcher = StockFetcher()
\ No newline at end of file
+stock_fetcher = StockFetcher()